@@ -1,93 +1,51 @@
 import numpy as np
-import sounddevice as sd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-from scipy.io.wavfile import write
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import json
 import os
-import subprocess     # launch helper scripts
-
-# File written by ⭐ Mark Tone in consciousness_resonator.py
-USER_RES_FILE = "user_resonance.json"
+import threading
+import time
+from collections import deque
+
+import presets
+from audio_engine import (LAYER_MODES, LayerBank, ParamStore, binaural_chunks,
+                          bind_var, layer_chunks, pack_layers, shared_mixer,
+                          write_chunks)
+from noise import COLOURS, ColouredNoise, add_noise
+from session import Session
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, cols: int):
+    """Reduce a trace to the min and max of each of *cols* pixel columns.
+
+    Drawing both extremes per column keeps the visual envelope of a dense
+    waveform while handing matplotlib only ``2*cols`` points.
+    """
+    per = len(y) // cols
+    if per < 2:
+        return x, y
+    m  = per * cols
+    yy = y[:m].reshape(cols, per)
+    out = np.empty(2 * cols)
+    out[0::2] = yy.min(axis=1); out[1::2] = yy.max(axis=1)
+    return np.repeat(x[:m:per], 2), out
 
 class BinauralApp:
 # ─────────────────────────── Preset data ────────────────────────────
-    PRESETS_FILE = "binaural_presets.json"
-    DEFAULT_PRESETS = {
-    # Δ Delta ‑ 0.5‑4 Hz
-    "Delta Sleep":        {"carrier": 120.0, "beat": 3.5, "desc": "Delta rhythm for restful, deep sleep."},
-    "Delta Healing":      {"carrier": 100.0, "beat": 2.5, "desc": "Deep delta for physical healing."},
-    "Delta Renewal":      {"carrier": 100.0, "beat": 1.0, "desc": "Ultra‑low delta for cellular repair."},
-    "Deep Sleep":         {"carrier": 100.0, "beat": 1.5, "desc": "Sub‑delta drift for hypnosis & deep sleep."},
-    "Float State":        {"carrier":  80.0, "beat": 0.5, "desc": "Delta flotation state for introspection."},
-    "Astral Hum":         {"carrier":  30.0, "beat": 0.7, "desc": "Sub‑delta hum to ease into astral travel."},
-    "Focus 3":            {"carrier": 200.0, "beat": 3.0, "desc": "Monroe Focus 3 pre‑hypnagogic state."},
-
-    # Θ Theta ‑ 4‑8 Hz
-    "Theta Relax":        {"carrier": 200.0, "beat": 6.0, "desc": "Gentle theta for relaxation."},
-    "Theta Meditation":   {"carrier": 250.0, "beat": 5.0, "desc": "Theta rhythm for deep meditation."},
-    "Theta Insight":      {"carrier": 220.0, "beat": 7.0, "desc": "Theta for creative insights."},
-    "Gateway Voyage":     {"carrier": 100.0, "beat": 4.0, "desc": "Access deeper mind states, OBEs."},
-    "Lucid Entry":        {"carrier": 140.0, "beat": 6.0, "desc": "High‑theta for lucid dreaming."},
-    "Deep Theta OBE":     {"carrier": 180.0, "beat": 5.5, "desc": "Theta tuned for OBE induction."},
-    "Astra Journey":      {"carrier": 210.0, "beat": 7.5, "desc": "Theta blend for astral exploration."},
-    "OBE Induction":      {"carrier": 130.0, "beat": 4.5, "desc": "Hemi‑Sync OBE pattern."},
-    "Patterning":         {"carrier": 110.0, "beat": 7.0, "desc": "Hemi‑Sync patterning for visualization."},
-    "Stargate Schumann":  {"carrier": 100.0, "beat": 7.83,"desc": "Schumann resonance for clarity."},
-    "Stargate Protocol I":{"carrier":  90.0, "beat": 6.5,"desc": "Project Stargate pattern I."},
-
-    # Α Alpha ‑ 8‑13 Hz
-    "Alpha Relax":        {"carrier": 300.0, "beat":10.0,"desc": "Alpha for calm and stress relief."},
-    "Alpha Creativity":   {"carrier": 270.0, "beat": 8.0,"desc": "Alpha to boost creativity."},
-    "Alpha Focus":        {"carrier": 260.0, "beat":12.0,"desc": "Upper‑alpha focus."},
-    "Alpha Memory":       {"carrier": 240.0, "beat": 9.0,"desc": "Alpha to enhance memory."},
-    "Mind Mirror":        {"carrier": 150.0, "beat": 8.0,"desc": "Alpha/SMR blend for clarity."},
-    "Light Journey":      {"carrier": 200.0, "beat":10.0,"desc": "Alpha exploration."},
-    "Focus 10":           {"carrier": 100.0, "beat":10.0,"desc": "Mind awake, body asleep."},
-    "Focus 12":           {"carrier": 100.0, "beat":12.0,"desc": "Expanded awareness."},
-    "Focus 13":           {"carrier": 110.0, "beat":13.0,"desc": "Coherence bridge between Focus 12 & 15."},
-    "Stargate Protocol II":{"carrier": 90.0, "beat": 9.5,"desc": "Project Stargate pattern II."},
-
-    # Β Beta ‑ 13‑30 Hz   (Monroe higher foci map ≈ beat‑freq index)
-    "Beta Focus":         {"carrier": 210.0, "beat":14.0,"desc": "Low‑beta focused attention."},
-    "Focus 15":           {"carrier": 200.0, "beat":15.0,"desc": "Focus 15: no‑time state."},
-    "Beta Cognition":     {"carrier": 200.0, "beat":16.0,"desc": "Mid‑beta analytical thinking."},
-    "Focus 18":           {"carrier": 120.0, "beat":18.0,"desc": "Heart‑centered emotional healing zone."},
-    "Beta Alertness":     {"carrier": 160.0, "beat":18.0,"desc": "High‑beta alertness."},
-    "Beta Energy":        {"carrier": 150.0, "beat":20.0,"desc": "High‑beta motivation."},
-    "Focus 21":           {"carrier": 150.0, "beat":21.0,"desc": "Focus 21: bridge to the astral."},
-    "Focus 22":           {"carrier": 140.0, "beat":22.0,"desc": "Territory of confused, dream‑bound minds."},
-    "Beta Performance":   {"carrier": 180.0, "beat":22.0,"desc": "Peak‑beta performance."},
-    "Focus 23":           {"carrier": 135.0, "beat":23.0,"desc": "Recently deceased attached to Earth life."},
-    "Focus 24":           {"carrier": 130.0, "beat":24.0,"desc": "Collective belief‑system regions."},
-    "Brain Spark":        {"carrier": 200.0, "beat":25.0,"desc": "High‑beta spark for alertness."},
-    "Focus 25":           {"carrier": 125.0, "beat":25.0,"desc": "Power/guru belief territories."},
-    "Focus 26":           {"carrier": 120.0, "beat":26.0,"desc": "Transition zone beyond rigid belief."},
-    "Focus 27":           {"carrier": 150.0, "beat":27.0,"desc": "Focus 27: reception & planning center."},
-
-    # Γ Gamma ‑ 30‑50 Hz
-    "Gamma Integration":  {"carrier": 400.0, "beat":30.0,"desc": "Gamma for information integration."},
-    "Focus 34":           {"carrier": 180.0, "beat":34.0,"desc": "NPC junction – collective cluster."},
-    "Gamma Learning":     {"carrier": 360.0, "beat":35.0,"desc": "Gamma for accelerated learning."},
-    "Focus 35":           {"carrier": 175.0, "beat":35.0,"desc": "Inter‑civilisation gathering point."},
-    "Gamma Cognition":    {"carrier": 420.0, "beat":40.0,"desc": "High‑gamma cognition."},
-    "Focus 42":           {"carrier": 200.0, "beat":42.0,"desc": "Cosmic consciousness plateau."},
-    "Gamma Consciousness":{"carrier": 300.0, "beat":45.0,"desc": "Gamma for expanded awareness."},
-    "Focus 49":           {"carrier": 210.0, "beat":49.0,"desc": "Edge of mapped human territory."}
-}
-
-    CATEGORIES = {
-        "Delta Waves (0.5–4 Hz)": list(DEFAULT_PRESETS.keys())[:7],
-        "Theta Waves (4–8 Hz)":   list(DEFAULT_PRESETS.keys())[7:18],
-        "Alpha Waves (8–12 Hz)":  list(DEFAULT_PRESETS.keys())[18:27],
-        "Beta Waves (13–30 Hz)":  list(DEFAULT_PRESETS.keys())[27:37],
-        "Gamma Waves (30–50 Hz)": list(DEFAULT_PRESETS.keys())[37:41],
-    }
+    PRESETS_DB      = presets.PRESETS_DB
+    DEFAULT_PRESETS = presets.DEFAULT_PRESETS
+    CATEGORIES      = presets.CATEGORIES
 
     SAMPLE_RATE = 44_100
     BLOCKSIZE   = 1_024
+    PLOT_FPS    = 20           # redraw cap for the oscilloscope
+    STATUS_MS   = 60           # debounce for the carrier/beat read-out
+    SEARCH_MAX  = 500          # rows shown under "Search results"
+
+    # Audio-callback stats: JSON-lines dump file and tracemalloc sampling
+    STATS_LOG    = os.environ.get("BINAURAL_STATS_LOG")
+    STATS_LOG_S  = 10
+    ALLOC_SAMPLE = int(os.environ.get("BINAURAL_ALLOC_SAMPLE", "0"))
 
     # ─────────────────────────── Init ────────────────────────────
     def __init__(self, master: tk.Tk):
@@ -95,44 +53,61 @@ class BinauralApp:
         master.title("Binaural Beat Lab")
         master.geometry("900x780")
 
-        self.stream = None
-        self.left_phase = self.right_phase = 0.0
+        self.mixer = shared_mixer(self.SAMPLE_RATE, self.BLOCKSIZE)
+        self.tones = LayerBank(self.SAMPLE_RATE, self.BLOCKSIZE)
+        self.layers = []               # extra layers stacked on the slider tone
+        self.session = None            # Session driving the callback, if any
+        self.session_pos = 0           # frames rendered (audio thread)
+        self.session_name = ""
+        self.noise = None              # ColouredNoise layer, or None when off
         self.selected_preset = None
 
         self.carrier_var = tk.DoubleVar(value=100.0)
         self.beat_var    = tk.DoubleVar(value=4.0)
         self.volume_var  = tk.DoubleVar(value=0.5)
+        self.noise_colour = tk.StringVar(value="off")
+        self.noise_var    = tk.DoubleVar(value=0.3)
+
+        # Snapshot read by the audio thread (no Tcl calls in the callback)
+        self.params = ParamStore()
+        bind_var(self.params, "carrier", self.carrier_var)
+        bind_var(self.params, "beat",    self.beat_var)
+        bind_var(self.params, "volume",  self.volume_var)
+        bind_var(self.params, "noise",   self.noise_var)
+        self._publish_layers()
 
         self._load_presets()
         self._build_ui()
-        self._init_plot()
-        self._refresh_ui()
-        self.master.after(100, self._update_plot)
+        self._build_tree()
+        self._status_job = None
+        self._refresh_status()
+
+        # matplotlib is the slowest import: build the plot once the window is up
+        self.viz_frame.bind("<Map>", self._on_first_map)
+
+        self.carrier_var.trace_add("write", lambda *_: self._schedule_status())
+        self.beat_var.trace_add("write",    lambda *_: self._schedule_status())
+
+        # Tool windows live in this process; the resonator announces new tones
+        self.tools = {}                # window name → app object
+        master.bind("<<ResonancesChanged>>", lambda _: self._reload_resonances())
 
-        self.carrier_var.trace_add("write", lambda *_: self._refresh_ui())
-        self.beat_var.trace_add("write",    lambda *_: self._refresh_ui())
+        self.mixer.sample_allocations(self.ALLOC_SAMPLE)
+        if self.STATS_LOG:
+            self.master.after(self.STATS_LOG_S * 1000, self._log_stats)
 
     # ─────────── Load presets & personal resonances ────────────
     def _load_presets(self):
-        if not os.path.exists(self.PRESETS_FILE):
-            json.dump(self.DEFAULT_PRESETS, open(self.PRESETS_FILE, "w"), indent=4)
-        self.presets = json.load(open(self.PRESETS_FILE, "r"))
-
-        if os.path.exists(USER_RES_FILE):
-            try:
-                data = json.load(open(USER_RES_FILE, "r"))
-                if isinstance(data, dict):       # legacy single‑object file
-                    data = [data]
-                for idx, rec in enumerate(data, start=1):
-                    hz = float(rec.get("hz") or rec.get("personal_resonance", 0))
-                    if hz > 0:
-                        self.presets[f"Personal Resonance #{idx}"] = {
-                            "carrier": hz,
-                            "beat": 0.0,
-                            "desc": "Saved Consciousness Resonator tone."
-                        }
-            except Exception:
-                pass  # ignore corrupt file
+        self.store   = presets.PresetStore(self.PRESETS_DB)
+        self.presets = self.store.all()
+        self.res_log = presets.ResonanceLog()
+        try:
+            tones = self.res_log.records()
+        except OSError:
+            tones = []
+        self.presets.update(presets.resonance_presets(tones))
+        self._res_seen = (self.res_log.generation, len(tones))
+        self.index   = None        # PresetIndex, rebuilt lazily after edits
 
     # ────────────────────────── UI build ──────────────────────────
     def _build_ui(self):
@@ -171,17 +146,29 @@ class BinauralApp:
                 orient="horizontal").grid(row=4, column=1, columnspan=2,
                                             sticky="ew", **pad)
 
+        # Noise bed under the beat
+        nf = ttk.Frame(main); nf.grid(row=4, column=3, sticky="e", **pad)
+        ttk.Label(nf, text="Noise").pack(side="left")
+        noise_box = ttk.Combobox(nf, textvariable=self.noise_colour, width=6,
+                                 values=("off",) + COLOURS, state="readonly")
+        noise_box.pack(side="left", padx=4)
+        noise_box.bind("<<ComboboxSelected>>", lambda _: self._set_noise())
+        ttk.Scale(nf, from_=0, to=1, variable=self.noise_var, length=90,
+                  orient="horizontal").pack(side="left")
+
         # Playback + launchers
         pf = ttk.Frame(main); pf.grid(row=5, column=0, columnspan=4, **pad)
         ttk.Button(pf, text="▶ Start", command=self.start_audio
                   ).pack(side="left", **pad)
         ttk.Button(pf, text="■ Stop", command=self.stop_audio
                   ).pack(side="left", **pad)
+        ttk.Button(pf, text="📜 Session…", command=self.load_session
+                  ).pack(side="left", **pad)
+        ttk.Button(pf, text="🎚 Layers…", command=self.edit_layers
+                  ).pack(side="left", **pad)
         ttk.Button(pf, text="✨ Consciousness Resonator",
-                command=lambda: subprocess.Popen(
-                    ["python", "consciousness_resonator.py"])
+                command=self.launch_resonator
                 ).pack(side="left", padx=5, pady=5)
-        #  ← NEW Affirmation Loop launcher
         ttk.Button(pf, text="🔁 Affirmation Loop",
                 command=self.launch_affirmation
                 ).pack(side="left", padx=5, pady=5)
@@ -197,12 +184,20 @@ class BinauralApp:
                   ).pack(side="left", **pad)
         ttk.Button(af, text="⬇ Export", command=self.export_audio
                   ).pack(side="left", **pad)
+        ttk.Button(af, text="📈 Audio Stats", command=self.show_audio_stats
+                  ).pack(side="left", **pad)
 
         # Preset tree
         ttk.Label(main, text="Load Preset").grid(row=8, column=0, sticky="nw", **pad)
         tree_frame = ttk.Frame(main); tree_frame.grid(row=8, column=1, columnspan=3,
                                                       sticky="nsew", **pad)
-        tree_frame.rowconfigure(0, weight=1); tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(1, weight=1); tree_frame.columnconfigure(0, weight=1)
+
+        # Search: text, band names and ranges, e.g. "beat 6–8 Hz, carrier < 150"
+        self.search_var = tk.StringVar()
+        ttk.Entry(tree_frame, textvariable=self.search_var
+                 ).grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 4))
+        self.search_var.trace_add("write", lambda *_: self._apply_search())
 
         self.tree = ttk.Treeview(tree_frame, columns=("Desc",), show="tree headings",
                                 selectmode="browse")
@@ -212,7 +207,7 @@ class BinauralApp:
 
         vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=vsb.set)
-        self.tree.grid(row=0, column=0, sticky="nsew"); vsb.grid(row=0, column=1, sticky="ns")
+        self.tree.grid(row=1, column=0, sticky="nsew"); vsb.grid(row=1, column=1, sticky="ns")
         self.tree.bind("<<TreeviewSelect>>", self.load_preset)
 
         # Plot frame
@@ -224,43 +219,103 @@ class BinauralApp:
                 ).grid(row=10, column=0, columnspan=4, pady=(2, 0))
 
     # ───────────────────────── Plotting ──────────────────────────
+    def _on_first_map(self, _event):
+        self.viz_frame.unbind("<Map>")
+        self.master.after_idle(self._start_plot)
+
+    def _start_plot(self):
+        self._init_plot()
+        self._update_plot()
+
     def _init_plot(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         self.fig = Figure(figsize=(6, 2.5), dpi=100)
         self.fig.subplots_adjust(left=0.12, right=0.98, top=0.92,
                                 bottom=0.10, hspace=0.4)
+        # Traces are animated: full draws skip them and they are blitted on
+        # top of a cached background of axes, ticks and legend.
         self.ax1 = self.fig.add_subplot(211)
-        self.line1, = self.ax1.plot([], [], lw=1, label="Left")
-        self.line2, = self.ax1.plot([], [], lw=1, label="Right")
+        self.line1, = self.ax1.plot([], [], lw=1, label="Left", animated=True)
+        self.line2, = self.ax1.plot([], [], lw=1, label="Right", animated=True)
         self.ax1.set_ylabel("Amplitude"); self.ax1.set_ylim(-1, 1)
         self.ax1.legend(loc="upper right", fontsize="small")
 
         self.ax2 = self.fig.add_subplot(212)
-        self.env_line, = self.ax2.plot([], [], lw=1)
+        self.env_line, = self.ax2.plot([], [], lw=1, animated=True)
         self.ax2.set_xlabel("Time (s)"); self.ax2.set_ylabel("Envelope"); self.ax2.set_ylim(0, 1)
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.viz_frame)
+        self.plot_stats = ttk.Label(self.viz_frame, text="", font=("Arial", 8),
+                                    foreground="gray")
+        self.plot_stats.pack(side="bottom", anchor="e")
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+        self._plot_bg     = None         # cached (ax1, ax2) backgrounds
+        self._plot_key    = None         # (carrier, beat, px) last drawn
+        self._plot_window = None         # x-range of the current axes
+        self._frame_ms    = deque(maxlen=50)
+        self._stats_at    = 0.0
+        self.canvas.mpl_connect("draw_event", self._on_plot_draw)
+
+    def _on_plot_draw(self, _event):
+        """After any full draw (first show, resize, new x-range): re-cache."""
+        self._plot_bg = [self.canvas.copy_from_bbox(ax.bbox)
+                         for ax in (self.ax1, self.ax2)]
+        self._draw_traces()
+
+    def _draw_traces(self):
+        self.ax1.draw_artist(self.line1); self.ax1.draw_artist(self.line2)
+        self.ax2.draw_artist(self.env_line)
+
     def _update_plot(self):
-        b = self.beat_var.get() or 1.0
+        self.master.after(1000 // self.PLOT_FPS, self._update_plot)
+        p  = self.params.snapshot()
+        c  = p["carrier"]; b = p["beat"] or 1.0
+        px = max(1, int(self.ax1.bbox.width))
+        if (c, b, px) == self._plot_key and self._plot_bg is not None:
+            return                                  # nothing changed
+        t0 = time.perf_counter()
+
         window = min(0.5, max(0.05, 2.0 / b))
         t = np.linspace(0, window, int(self.SAMPLE_RATE * window), endpoint=False)
-        c = self.carrier_var.get()
         y1 = np.sin(2 * np.pi * c * t)
         y2 = np.sin(2 * np.pi * (c + b) * t)
         env = np.abs(y1 - y2) / 2
 
-        self.line1.set_data(t, y1); self.line2.set_data(t, y2)
-        self.env_line.set_data(t, env)
-        self.ax1.set_xlim(0, window); self.ax2.set_xlim(0, window)
-        self.canvas.draw()
-        self.master.after(100, self._update_plot)
-
-        # ─────────────── UI refresh (incl. highlight) ───────────────
-    def _refresh_ui(self):
-        # Update preset label
-        self.preset_label.config(text=f"Preset: {self.selected_preset or 'None'}")
-
+        self.line1.set_data(*minmax_decimate(t, y1, px))
+        self.line2.set_data(*minmax_decimate(t, y2, px))
+        self.env_line.set_data(*minmax_decimate(t, env, px))
+        if window != self._plot_window or self._plot_bg is None:
+            self._plot_window = window
+            self.ax1.set_xlim(0, window); self.ax2.set_xlim(0, window)
+            self.canvas.draw()                      # ticks changed
+        else:
+            for bg in self._plot_bg:
+                self.canvas.restore_region(bg)
+            self._draw_traces()
+            self.canvas.blit(self.ax1.bbox); self.canvas.blit(self.ax2.bbox)
+        self._plot_key = (c, b, px)
+
+        # Frame-time counter, refreshed at most once a second
+        self._frame_ms.append((time.perf_counter() - t0) * 1000)
+        if t0 - self._stats_at >= 1.0:
+            self._stats_at = t0
+            ms = self._frame_ms
+            self.plot_stats.config(
+                text=f"plot {sum(ms)/len(ms):.1f} ms avg · {max(ms):.1f} ms max "
+                     f"(budget {1000 / self.PLOT_FPS:.0f} ms)")
+
+    # ─────────────── Status read-out (debounced) ───────────────
+    def _schedule_status(self):
+        # Slider drags fire a trace per pixel; coalesce them into one update
+        if self._status_job is not None:
+            self.master.after_cancel(self._status_job)
+        self._status_job = self.master.after(self.STATUS_MS, self._refresh_status)
+
+    def _refresh_status(self):
+        self._status_job = None
         # ==== GUARD AGAINST EMPTY/INVALID ENTRY ====
         try:
             carrier = float(self.carrier_var.get())
@@ -271,56 +326,198 @@ class BinauralApp:
 
         # Now it’s safe to format to 3 decimal places
         self.status.config(
-            text=f"Carrier: {carrier:.3f} Hz | Beat: {beat:.3f} Hz"
+            text=f"Carrier: {carrier:.3f} Hz | Beat: {beat:.3f} Hz"
         )
 
-        # ===== REST OF UI REFRESH UNCHANGED =====
-        self.tree.delete(*self.tree.get_children())
+    # ─────────────── Preset tree (built once, then patched) ───────────────
+    def _build_tree(self):
+        self._tree_items = {}           # preset name → tree iid
+        self._cat_iids   = {}           # category → parent iid
+        self._custom_iid = None
+        self._results_iid = None
         for cat, names in self.CATEGORIES.items():
-            parent = self.tree.insert("", "end", text=cat, open=True)
+            self._cat_iids[cat] = self.tree.insert("", "end", text=cat, open=True)
             for name in names:
                 if name in self.presets:
-                    desc = self.presets[name].get("desc", "")
-                    tags = ("highlight",) if name == self.selected_preset else ()
-                    self.tree.insert(parent, "end", text=name,
-                                    values=(desc,), tags=tags)
-
-        # Add any custom presets
-        custom = [n for n in self.presets if n not in self.DEFAULT_PRESETS]
-        if custom:
-            parent = self.tree.insert("", "end", text="Custom Sounds", open=True)
-            for name in custom:
-                desc = self.presets[name].get("desc", "")
-                tags = ("highlight",) if name == self.selected_preset else ()
-                self.tree.insert(parent, "end", text=name,
-                                values=(desc,), tags=tags)
-
+                    self._tree_insert(name)
+        for name in self.presets:
+            if name not in self._tree_items:
+                self._tree_insert(name)
+        self._set_selected(self.selected_preset)
+
+    def _tree_insert(self, name: str):
+        """Add *name* under its category, or update it if already shown."""
+        desc = self.presets[name].get("desc", "")
+        if name in self._tree_items:
+            self.tree.item(self._tree_items[name], values=(desc,)); return
+        for cat, names in self.CATEGORIES.items():
+            if name in names:
+                parent = self._cat_iids[cat]
+                # keep built-in order: count shown presets listed before it
+                index = sum(n in self._tree_items for n in names[:names.index(name)])
+                break
+        else:
+            if self._custom_iid is None:
+                self._custom_iid = self.tree.insert("", "end", text="Custom Sounds",
+                                                    open=True)
+            parent, index = self._custom_iid, "end"
+        self._tree_items[name] = self.tree.insert(parent, index, text=name,
+                                                  values=(desc,))
+
+    def _tree_delete(self, name: str):
+        iid = self._tree_items.pop(name, None)
+        if iid is None: return
+        self.tree.delete(iid)
+        if self._custom_iid and not self.tree.get_children(self._custom_iid):
+            self.tree.delete(self._custom_iid); self._custom_iid = None
+
+    def _apply_search(self):
+        """Swap the category view for a flat, ranked list of search hits."""
+        if self._results_iid is not None:
+            self.tree.delete(self._results_iid); self._results_iid = None
+        query = self.search_var.get().strip()
+        tops  = list(self._cat_iids.values()) + [i for i in (self._custom_iid,) if i]
+        if not query:
+            for pos, iid in enumerate(tops):
+                self.tree.reattach(iid, "", pos)
+            return
+        self.tree.detach(*tops)
+        if self.index is None:
+            self.index = presets.PresetIndex(self.presets)
+        hits = self.index.search(query)
+        self._results_iid = self.tree.insert(
+            "", "end", text=f"Search results ({len(hits)})", open=True)
+        for name in hits[:self.SEARCH_MAX]:
+            tags = ("highlight",) if name == self.selected_preset else ()
+            self.tree.insert(self._results_iid, "end", text=name,
+                             values=(self.presets[name].get("desc", ""),), tags=tags)
+
+    def _set_selected(self, name):
+        """Move the highlight tag from the old selection to *name*."""
+        old = self._tree_items.get(self.selected_preset)
+        if old and self.tree.exists(old):
+            self.tree.item(old, tags=())
+        self.selected_preset = name
+        new = self._tree_items.get(name)
+        if new:
+            self.tree.item(new, tags=("highlight",))
+        self.preset_label.config(text=f"Preset: {name or 'None'}")
 
     # ──────────────── Audio callback & stream ────────────────
     def start_audio(self):
-        if self.stream:
-            self.stop_audio()
-        self.stream = sd.OutputStream(samplerate=self.SAMPLE_RATE, channels=2,
-                                    blocksize=self.BLOCKSIZE,
-                                    callback=self._audio_callback)
-        self.stream.start()
+        self.session = None            # sliders take over again
+        self._open_stream()
+
+    def _open_stream(self):
+        # One shared output stream: the tone is a source on the mixer
+        self.mixer.add_source("binaural", self._audio_callback, bus="binaural")
 
     def stop_audio(self):
-        if self.stream:
-            self.stream.stop(); self.stream.close()
-            self.stream = None
+        self.mixer.remove_source("binaural")
+
+    def _set_noise(self):
+        colour = self.noise_colour.get()
+        # A fresh source is swapped in whole; the callback reads self.noise once
+        self.noise = ColouredNoise(colour, 2) if colour in COLOURS else None
 
     def _audio_callback(self, outdata, frames, *_):
-        c, b = self.carrier_var.get(), self.beat_var.get()
-        v    = self.volume_var.get()
-        d1   = 2*np.pi*c / self.SAMPLE_RATE
-        d2   = 2*np.pi*(c+b) / self.SAMPLE_RATE
-        idx  = np.arange(frames)
-        p1   = self.left_phase  + d1*idx
-        p2   = self.right_phase + d2*idx
-        outdata[:] = (np.stack([np.sin(p1), np.sin(p2)], axis=-1) * v).astype(np.float32)
-        self.left_phase  = (p1[-1] + d1) % (2*np.pi)
-        self.right_phase = (p2[-1] + d2) % (2*np.pi)
+        session = self.session
+        p = self.params.snapshot()
+        if session is not None:
+            session.render(outdata, self.session_pos)
+            self.session_pos += frames
+        else:
+            layers = self.layer_pack       # row 0 is the slider tone
+            layers[0, 1], layers[0, 2] = p["carrier"], p["beat"]
+            self.tones.render(outdata, layers, p["volume"])
+        noise = self.noise
+        if noise is not None:
+            noise.render(outdata, p["noise"], add=True)
+
+    # ───────────────────────── Layers ─────────────────────────
+    def _publish_layers(self):
+        # A new array is swapped in whole; only the callback writes row 0
+        self.layer_pack = pack_layers(
+            [{"carrier": self.params["carrier"], "beat": self.params["beat"]}]
+            + self.layers)
+
+    def edit_layers(self):
+        win = tk.Toplevel(self.master); win.title("Layers")
+        win.transient(self.master)
+        cols = ("Mode", "Carrier", "Beat", "Gain")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=8,
+                            selectmode="browse")
+        for col in cols:
+            tree.heading(col, text=col); tree.column(col, width=90)
+        tree.grid(row=0, column=0, columnspan=6, sticky="nsew", padx=5, pady=5)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for i, l in enumerate(self.layers):
+                tree.insert("", "end", iid=str(i), values=(
+                    l["mode"], f"{l['carrier']:g}", f"{l['beat']:g}", f"{l['gain']:g}"))
+
+        mode = tk.StringVar(value=LAYER_MODES[0])
+        fields = [tk.DoubleVar(value=v) for v in
+                  (self.carrier_var.get(), self.beat_var.get(), 0.5)]
+        ttk.Combobox(win, textvariable=mode, values=LAYER_MODES, width=10,
+                     state="readonly").grid(row=1, column=0, padx=5)
+        for i, var in enumerate(fields):
+            ttk.Entry(win, textvariable=var, width=8).grid(row=1, column=i + 1, padx=2)
+
+        def add():
+            try:
+                c, b, g = (v.get() for v in fields)
+            except tk.TclError:
+                messagebox.showerror("Layers", "Carrier, beat and gain must be numbers.",
+                                     parent=win); return
+            self.layers.append({"mode": mode.get(), "carrier": c, "beat": b, "gain": g})
+            self._publish_layers(); refresh()
+
+        def remove():
+            sel = tree.selection()
+            if not sel: return
+            del self.layers[int(sel[0])]
+            self._publish_layers(); refresh()
+
+        ttk.Button(win, text="➕ Add", command=add).grid(row=1, column=4, padx=2)
+        ttk.Button(win, text="🗑️ Remove", command=remove).grid(row=1, column=5, padx=2)
+        ttk.Label(win, text="Layers play on top of the slider tone.",
+                  font=("Arial", 9, "italic"), foreground="gray"
+                  ).grid(row=2, column=0, columnspan=6, pady=(2, 6))
+        refresh()
+
+    # ───────────────────────── Sessions ─────────────────────────
+    def load_session(self):
+        fn = filedialog.askopenfilename(title="Open session",
+                                        filetypes=[("Session", "*.json"),
+                                                   ("All files", "*.*")])
+        if not fn: return
+        try:
+            session = Session.load(fn, self.SAMPLE_RATE, self.presets)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Session", str(e)); return
+        self.stop_audio()
+        self.session, self.session_pos = session, 0
+        self.session_name = os.path.basename(fn)
+        self._open_stream()
+        self._poll_session()
+
+    def _poll_session(self):
+        s = self.session
+        if s is None or not self.mixer.is_active("binaural"): return
+        pos = min(self.session_pos, s.frames)
+        i   = s.segment_at(pos)
+        self.status.config(
+            text=f"{self.session_name}: segment {i + 1}/{len(s.segments)} · "
+                 f"{pos // self.SAMPLE_RATE // 60}:{pos // self.SAMPLE_RATE % 60:02d}"
+                 f" / {s.frames // self.SAMPLE_RATE // 60}:"
+                 f"{s.frames // self.SAMPLE_RATE % 60:02d}")
+        if self.session_pos >= s.frames:
+            self.stop_audio()
+            self.status.config(text=f"{self.session_name}: finished")
+            return
+        self.master.after(500, self._poll_session)
 
     # ───────────────────────── Preset CRUD ─────────────────────────
     def save_preset(self):
@@ -333,9 +530,11 @@ class BinauralApp:
             "beat":    self.beat_var.get(),
             "desc":    desc
         }
-        self.selected_preset = name
-        json.dump(self.presets, open(self.PRESETS_FILE, "w"), indent=4)
-        self._refresh_ui()
+        self.store.put(name, self.presets[name])
+        self.index = None
+        self._tree_insert(name)
+        self._set_selected(name)
+        self._apply_search()
         messagebox.showinfo("Saved", f"Preset '{name}' saved.")
 
     def delete_preset(self):
@@ -343,10 +542,12 @@ class BinauralApp:
         if not name:
             messagebox.showwarning("No Selection", "Select a preset to delete."); return
         if not messagebox.askyesno("Confirm Delete", f"Delete '{name}'?"): return
-        self.presets.pop(name, None); self.selected_preset = None
+        self.presets.pop(name, None); self._set_selected(None)
         self.preset_entry.delete(0, tk.END)
-        json.dump(self.presets, open(self.PRESETS_FILE, "w"), indent=4)
-        self._refresh_ui()
+        self.store.delete(name)
+        self.index = None
+        self._tree_delete(name)
+        self._apply_search()
         messagebox.showinfo("Deleted", f"Preset '{name}' deleted.")
 
     def load_preset(self, *_):
@@ -355,37 +556,167 @@ class BinauralApp:
         name = self.tree.item(sel[0], "text")
         prefs = self.presets.get(name)
         if not prefs: return
-        self.selected_preset = name
+        self._set_selected(name)
         self.preset_entry.delete(0, tk.END); self.preset_entry.insert(0, name)
         self.carrier_var.set(prefs["carrier"]); self.beat_var.set(prefs["beat"])
-        self._refresh_ui()
 
     # ───────────────────────── WAV export ─────────────────────────
     def export_audio(self):
-        dur = simpledialog.askfloat("Export", "Length (sec):", initialvalue=5.0)
-        if not dur or dur <= 0: return
-        fs = self.SAMPLE_RATE
-        t  = np.linspace(0, dur, int(fs * dur), endpoint=False)
-        c, b = self.carrier_var.get(), self.beat_var.get()
-        left  = np.sin(2*np.pi*c*t)
-        right = np.sin(2*np.pi*(c+b)*t)
-        data  = np.int16(np.stack([left, right], axis=-1) /
-                         np.max(np.abs(np.stack([left, right], axis=-1))) * 32767)
+        session = self.session
+        if session is not None and not messagebox.askyesno(
+                "Export", f"Export session '{self.session_name}' "
+                          f"({session.seconds / 60:.1f} min)?\n"
+                          "Choose No to export the current tone instead."):
+            session = None
+        if session is None:
+            dur = simpledialog.askfloat("Export", "Length (sec):", initialvalue=5.0)
+            if not dur or dur <= 0: return
         fn = filedialog.asksaveasfilename(defaultextension=".wav",
                                         filetypes=[("WAV", "*.wav")])
-        if fn:
-            write(fn, fs, data)
-            messagebox.showinfo("Exported", f"Saved to {fn}")
+        if not fn: return
+        c, b = self.carrier_var.get(), self.beat_var.get()
+        if session is not None:        # private copy: the callback owns its buffers
+            session = Session(session.segments, self.SAMPLE_RATE)
+            chunks, total = session.chunks(), session.frames
+        else:
+            total  = int(self.SAMPLE_RATE * dur)
+            if self.layers:
+                chunks = layer_chunks(pack_layers([{"carrier": c, "beat": b}]
+                                                  + self.layers),
+                                      total, self.SAMPLE_RATE)
+            else:
+                chunks = binaural_chunks(c, b, total, self.SAMPLE_RATE)
+        if self.noise is not None:
+            chunks = add_noise(chunks, self.noise.colour, self.noise_var.get())
+
+        # Progress dialog; the render itself streams to disk on a worker
+        win = tk.Toplevel(self.master); win.title("Exporting…")
+        win.transient(self.master); win.resizable(False, False)
+        bar = ttk.Progressbar(win, length=300, maximum=1.0)
+        bar.pack(padx=10, pady=10)
+        cancel = threading.Event()
+        ttk.Button(win, text="Cancel", command=cancel.set).pack(pady=(0, 10))
+        win.protocol("WM_DELETE_WINDOW", cancel.set)
+        state = {"frac": 0.0, "result": None}
+
+        def progress(done, total):
+            state["frac"] = done / total
+            return not cancel.is_set()
+
+        def work():
+            try:
+                state["result"] = write_chunks(fn, chunks, total,
+                                               self.SAMPLE_RATE, progress)
+            except Exception as e:
+                state["result"] = e
+
+        def poll():
+            bar["value"] = state["frac"]
+            res = state["result"]
+            if res is None:
+                self.master.after(100, poll); return
+            win.destroy()
+            if isinstance(res, Exception):
+                messagebox.showerror("Export failed", str(res))
+            elif res:
+                messagebox.showinfo("Exported", f"Saved to {fn}")
+            else:
+                messagebox.showinfo("Export", "Export cancelled.")
+
+        threading.Thread(target=work, daemon=True).start()
+        poll()
+
+    # ─────────────── Audio callback stats ───────────────
+    def show_audio_stats(self):
+        win = tk.Toplevel(self.master); win.title("Audio Stats")
+        win.transient(self.master)
+        cols = ("calls", "p50_ms", "p95_ms", "p99_ms", "max_ms", "late",
+                "output_underflow", "output_overflow")
+        heads = ("Calls", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Late",
+                 "Underflow", "Overflow")
+        tree = ttk.Treeview(win, columns=cols, show="tree headings", height=6)
+        tree.heading("#0", text="Callback"); tree.column("#0", width=110)
+        for col, head in zip(cols, heads):
+            tree.heading(col, text=head); tree.column(col, width=72, anchor="e")
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+        note = ttk.Label(win, text="", font=("Arial", 9), foreground="gray")
+        note.pack(anchor="w", padx=5)
+        ttk.Button(win, text="Reset", command=lambda: [
+            st.reset() for st in self.mixer.stats.values()]).pack(pady=(0, 6))
+
+        def refresh():
+            if not win.winfo_exists(): return
+            stats = self.mixer.stats_summary()
+            for name, row in stats.items():
+                values = [row[c] for c in cols]
+                if tree.exists(name):
+                    tree.item(name, values=values)
+                else:
+                    tree.insert("", "end", iid=name, text=name, values=values)
+            dl = stats["stream"]["deadline_ms"]
+            note.config(text=f"Block deadline {dl:.2f} ms · 'late' = calls over it; "
+                             "underflows come from the device")
+            win.after(500, refresh)
+        refresh()
+
+    def _log_stats(self):
+        try:
+            with open(self.STATS_LOG, "a") as f:
+                f.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                    "stats": self.mixer.stats_summary()}) + "\n")
+        except OSError:
+            pass                       # a stats log must never break playback
+        self.master.after(self.STATS_LOG_S * 1000, self._log_stats)
+
+    # ─────────────── Tool windows (same process) ───────────────
+    def _open_tool(self, name: str, factory):
+        """Raise the open *name* window, or build one with ``factory(win)``."""
+        app = self.tools.get(name)
+        if app is not None and app.master.winfo_exists():
+            app.master.deiconify(); app.master.lift()
+            return
+        win = tk.Toplevel(self.master)
+        try:
+            app = factory(win)
+        except Exception as e:
+            win.destroy()
+            messagebox.showerror(name, f"Could not open {name}:\n{e}")
+            return
+        win.protocol("WM_DELETE_WINDOW", app.on_close)
+        self.tools[name] = app
+
+    def launch_resonator(self):
+        from consciousness_resonator import ResonatorApp
+        self._open_tool("Consciousness Resonator", ResonatorApp)
 
-    # ────────────── Helper to launch affirmation loop ─────────────
     def launch_affirmation(self):
+        from affirmation_loop import AffirmationApp
+        self._open_tool("Affirmation Loop", AffirmationApp)
+
+    def _reload_resonances(self):
+        """Patch the Personal Resonance presets after the resonator saves.
+
+        Only tones appended since the last read are parsed and added; the
+        full diff runs when the log says earlier tones moved.
+        """
         try:
-            subprocess.Popen(["python", "affirmation_loop.py"])
-        except FileNotFoundError:
-            messagebox.showerror(
-                "File not found",
-                "affirmation_loop.py is missing. Please add it before launching."
-            )
+            tones = self.res_log.records()
+        except OSError:
+            return
+        gen, seen = self._res_seen
+        self._res_seen = (self.res_log.generation, len(tones))
+        if gen == self.res_log.generation:
+            fresh = presets.resonance_presets(tones[seen:], start=seen + 1)
+        else:
+            fresh = presets.resonance_presets(tones)
+            for name in [n for n in self.presets if n.startswith("Personal Resonance #")]:
+                if name not in fresh:
+                    self.presets.pop(name); self._tree_delete(name)
+        for name, rec in fresh.items():
+            if self.presets.get(name) != rec:
+                self.presets[name] = rec; self._tree_insert(name)
+        self.index = None
+        self._apply_search()
 
     # ───────────────────────── Main loop ─────────────────────────
     def run(self):
@@ -1,19 +1,28 @@
-import os, json, uuid
+import json, uuid
 from pathlib import Path
 from datetime import datetime
 
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
-import pyttsx3
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, simpledialog
 
+from audio_engine import ClipLoop, ParamStore, bind_var, shared_mixer
+from resampling import resample
+from tts_cache import Synthesiser, TTSCache
+
+# sounddevice and soundfile are imported where first used (pyttsx3 only in
+# the speech worker), so the window opens without waiting for PortAudio or
+# a speech engine.
+
 # ── configuration ─────────────────────────────────────────────
 A_DIR   = Path("affirmations")
 META    = A_DIR / "affirmations.json"
 SRATE   = 44_100
 BLOCK   = 1_024
+TTS_DIR      = A_DIR / "tts_cache"
+TTS_CACHE_MB = 256                         # spoken clips kept, least recently used go
+TTS_VOICE    = None                        # engine voice id; None = default
+TTS_RATE     = None                        # words per minute; None = default
 
 DEFAULT_TEXT = (
     "I am more than my physical body. Because I am more than physical matter, "
@@ -43,10 +52,17 @@ class AffirmationApp:
         self.record_buf    = []
         self.audio_data: np.ndarray | None = None
         self.buf_len = 0
-        self.play_ptr = 0
-        self.play_stream = None
+        self.loop: ClipLoop | None = None
+        self.params      = ParamStore(db=-15.0, loop_min=0.0)
+        self.mixer       = shared_mixer(SRATE, BLOCK)
         self.is_playing  = False
         self.title_text  = ""
+        self.tts         = Synthesiser(TTSCache(TTS_DIR, TTS_CACHE_MB * 2**20),
+                                       SRATE, TTS_VOICE, TTS_RATE)
+        self._tts_job    = None
+
+        bind_var(self.params, "db",       self.volume_db)
+        bind_var(self.params, "loop_min", self.loop_min)
 
         first = self._load_meta()
         self._build_ui()
@@ -215,14 +231,9 @@ class AffirmationApp:
         self.loop_min.set(rec.get("loop_min", 0.0))
         wav = A_DIR / rec["file"]
         if wav.exists():
+            import soundfile as sf
             data, sr = sf.read(str(wav), always_2d=False)
-            if sr != SRATE:
-                data = np.interp(
-                    np.linspace(0, len(data), int(len(data) * SRATE / sr), False),
-                    np.arange(len(data)),
-                    data
-                )
-            self.audio_data = data.astype("float32")
+            self.audio_data = resample(data, sr, SRATE).astype("float32")
         else:
             self.audio_data = None
         self.status.config(text=f"Loaded '{rec['title']}'")
@@ -233,6 +244,7 @@ class AffirmationApp:
             if self.mode.get() != "rec":
                 messagebox.showinfo("Mode", "Switch to 'Record Voice' first.")
                 return
+            import sounddevice as sd
             self.record_buf = []
             self.record_stream = sd.InputStream(
                 samplerate=SRATE, channels=1, blocksize=BLOCK,
@@ -262,6 +274,7 @@ class AffirmationApp:
             parent=self.master
         )
         if title:
+            import soundfile as sf
             new_id = str(uuid.uuid4())
             fname = f"{new_id}.wav"
             sf.write(str(A_DIR / fname), self.audio_data, SRATE)
@@ -285,55 +298,72 @@ class AffirmationApp:
 
     # ── playback ----------------------------------------------------------
     def _toggle_play(self):
-        if not self.is_playing:
-            if self.mode.get() == "tts":
-                text = self.text.get("1.0", "end").strip()
-                engine = pyttsx3.init()
-                engine.save_to_file(text, "tmp.wav")
-                engine.runAndWait()
-                data, sr = sf.read("tmp.wav", always_2d=False)
-                os.remove("tmp.wav")
-                if sr != SRATE:
-                    data = np.interp(
-                        np.linspace(0, len(data), int(len(data) * SRATE / sr), False),
-                        np.arange(len(data)),
-                        data
-                    )
-                self.audio_data = data.astype("float32")
-            if self.audio_data is None:
-                messagebox.showwarning("No audio", "Nothing to play.")
+        if self.is_playing:
+            self._stop_play()
+        elif self._tts_job is not None:
+            return                                  # still synthesising
+        elif self.mode.get() == "tts":
+            text = self.text.get("1.0", "end").strip()
+            if not text:
+                messagebox.showwarning("No text", "Affirmation text is empty.")
                 return
-            factor = 10 ** (self.volume_db.get() / 20)
-            self.audio_data *= factor
-            self.play_ptr = 0
-            self.buf_len = len(self.audio_data)
-            self.play_stream = sd.OutputStream(
-                samplerate=SRATE, channels=1, blocksize=BLOCK,
-                callback=self._play_callback
-            )
-            self.play_stream.start()
-            self.is_playing = True
-            self.rec_btn.config(text="■ Stop")
-            self.status.config(text="Playing…")
+            # Cached clips come back at once; new text is spoken by a worker
+            fut = self.tts.request(text)
+            if not fut.done():
+                self.status.config(text="Synthesising…")
+            self._poll_tts(fut)
         else:
-            self._stop_play()
+            self._start_play("Playing…")
 
-    def _play_callback(self, out, frames, time, status):
-        if status:
-            print(status)
-        end = self.play_ptr + frames
-        chunk = self.audio_data[self.play_ptr:end]
-        if len(chunk) < frames:
-            chunk = np.pad(chunk, (0, frames - len(chunk)))
+    def _poll_tts(self, fut):
+        if not fut.done():
+            self._tts_job = self.master.after(100, lambda: self._poll_tts(fut))
+            return
+        self._tts_job = None
+        try:
+            audio, info = fut.result()
+        except Exception as e:
+            self.status.config(text="")
+            messagebox.showerror("Text-to-speech", str(e))
+            return
+        self.audio_data = audio
+        st  = self.tts.cache.stats
+        how = "cached" if info["hit"] else f"spoken in {info['synth_s']:.1f} s"
+        self._start_play(f"Playing… ({how}; TTS cache {st['hits']} hits / "
+                         f"{st['misses']} misses)")
+
+    def _start_play(self, status: str):
+        if self.audio_data is None:
+            messagebox.showwarning("No audio", "Nothing to play.")
+            return
+        # The clip is looped in place; volume is applied per block, so
+        # audio_data keeps its original level across previews and saves
+        minutes = max(0.0, self.params["loop_min"])
+        self.loop = ClipLoop(self.audio_data, SRATE, BLOCK, minutes)
+        self.buf_len = len(self.audio_data)
+        self.mixer.add_source("affirmation", self._play_callback, bus="voice")
+        self.is_playing = True
+        self.rec_btn.config(text="■ Stop")
+        self.status.config(text=f"{status} – looping "
+                           + (f"for {minutes:g} min" if minutes else "until stopped"))
+        self._watch_play()
+
+    def _play_callback(self, out, frames, *_):
+        # Runs on the audio thread: no Tk calls, just report the end
+        return self.loop.render(out, 10 ** (self.params["db"] / 20))
+
+    def _watch_play(self):
+        if not self.is_playing:
+            return
+        if not self.mixer.is_active("affirmation"):
             self._stop_play()
-        out[:] = chunk.reshape(-1, 1)
-        self.play_ptr = end
+            return
+        self.master.after(100, self._watch_play)
 
     def _stop_play(self):
         if not self.is_playing:
             return
-        self.play_stream.stop()
-        self.play_stream.close()
+        self.mixer.remove_source("affirmation")
         self.is_playing = False
         self.status.config(text="")
 
@@ -351,6 +381,7 @@ class AffirmationApp:
         )
         if not title:
             return
+        import soundfile as sf
         new_id = self.selected_id or str(uuid.uuid4())
         fname = f"{new_id}.wav"
         sf.write(str(A_DIR / fname), self.audio_data, SRATE)
@@ -378,7 +409,18 @@ class AffirmationApp:
         self.status.config(text="")
 
     # ── run ---------------------------------------------------------------
+    def on_close(self):
+        self._stop_play()
+        if self._tts_job is not None:
+            self.master.after_cancel(self._tts_job)
+        self.tts.close()
+        if self.recording:             # drop the take; nothing to prompt for
+            self.record_stream.stop(); self.record_stream.close()
+            self.recording = False
+        self.master.destroy()
+
     def run(self):
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
         self.master.mainloop()
 
 # ── entry ---------------------------------------------------------------
@@ -0,0 +1,701 @@
+"""
+audio_engine.py
+───────────────
+Real-time audio helpers shared by the Binaural Lab tools.  Nothing in here
+touches Tk: the audio callback runs on the PortAudio thread and must never
+block on a Tcl round-trip.
+
+Key pieces
+──────────
+• ParamStore   → UI thread publishes values, audio thread reads a snapshot
+• SineBank     → allocation-free float32 oscillators written into outdata
+• LayerBank    → many binaural / monaural / isochronic layers in one 2-D batch
+• ClipLoop     → gapless crossfaded loop of a clip, gain applied per block
+• Mixer        → one output stream summing every tool's sources per bus
+• CallbackStats → deadline histograms and under/overflow counts per callback
+• binaural_chunks() → constant-memory chunked render of a plain tone
+• write_chunks() → stream any block generator (e.g. a Session) to disk
+"""
+
+import math
+import os
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+EXPORT_CHUNK = 65_536                      # frames per block written to disk
+
+
+# ───── Parameter hand-off ───────────────────────────────────────────────────
+class ParamStore:
+    """Lock-free parameter snapshot shared between the UI and audio threads.
+
+    The UI thread is the only writer.  Each ``set`` builds a fresh dict and
+    publishes it with a single reference assignment, which is atomic under
+    the GIL, so the audio callback always sees a consistent set of values
+    without taking a lock.
+    """
+
+    def __init__(self, **values: float) -> None:
+        self._snap: dict[str, float] = dict(values)
+
+    def set(self, **values: float) -> None:
+        snap = dict(self._snap)
+        snap.update(values)
+        self._snap = snap
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current values; treat the dict as read-only."""
+        return self._snap
+
+    def __getitem__(self, key: str) -> float:
+        return self._snap[key]
+
+
+def bind_var(store: ParamStore, key: str, var) -> None:
+    """Mirror a Tk variable into *store* on every write.
+
+    Invalid entry text (empty field, half-typed number) is ignored so the
+    audio thread keeps the last good value.
+    """
+    def _push(*_):
+        try:
+            store.set(**{key: float(var.get())})
+        except Exception:          # tk.TclError / ValueError on bad text
+            pass
+    var.trace_add("write", _push)
+    _push()
+
+
+# ───── Oscillators ──────────────────────────────────────────────────────────
+class SineBank:
+    """A few phase-continuous sine oscillators, one per output channel.
+
+    All work happens in float32 buffers allocated once per block size;
+    ``render`` writes straight into the PortAudio ``outdata`` block, so the
+    steady-state callback performs no heap allocation.  Frequency and gain
+    glide linearly from the previous block's values to the new ones, which
+    removes zipper noise while a slider is dragged, and the phase is carried
+    by a running sum of per-sample increments.
+    """
+
+    def __init__(self, channels: int, sample_rate: int, blocksize: int) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._resize(blocksize)
+        self.reset()
+
+    def _resize(self, frames: int) -> None:
+        self._unit = np.arange(1, frames + 1, dtype=np.float32) / frames
+        self._buf  = np.empty(frames, dtype=np.float32)
+        self._gbuf = np.empty(frames, dtype=np.float32)
+
+    def reset(self) -> None:
+        self.phase = [0.0] * self.channels      # radians, wrapped per block
+        self._freq = [None] * self.channels     # Hz at end of previous block
+        self._gain = None
+
+    def _glide(self, out: np.ndarray, start: float, stop: float) -> np.ndarray:
+        if start == stop:
+            out.fill(stop)
+        else:
+            np.multiply(self._unit, stop - start, out=out)
+            out += start
+        return out
+
+    def render(self, out: np.ndarray, freqs, gain: float) -> None:
+        """Fill ``out[:, ch]`` with a sine at ``freqs[ch]`` Hz times *gain*."""
+        if out.shape[0] != len(self._buf):      # host changed block size
+            self._resize(out.shape[0])
+        k  = 2*np.pi / self.sample_rate
+        g0 = gain if self._gain is None else self._gain
+        g  = self._glide(self._gbuf, g0, gain)
+        for ch, f in enumerate(freqs):
+            f0 = f if self._freq[ch] is None else self._freq[ch]
+            ph = self._glide(self._buf, f0*k, f*k)
+            np.cumsum(ph, out=ph)
+            ph += self.phase[ch]
+            self.phase[ch] = float(ph[-1]) % (2*np.pi)
+            np.sin(ph, out=ph)
+            np.multiply(ph, g, out=out[:, ch])
+            self._freq[ch] = f
+        self._gain = gain
+
+
+# ───── Layered tones ────────────────────────────────────────────────────────
+LAYER_MODES = ("binaural", "monaural", "isochronic")
+BINAURAL, MONAURAL, ISOCHRONIC = range(3)
+MAX_LAYERS = 16                            # layers a LayerBank preallocates for (grows)
+
+# Per mode: weights of (oscillator a, oscillator b) into (left, right)
+_LAYER_MIX = np.array([[[1.0, 0.0], [0.0, 1.0]],      # binaural:  c | c+beat
+                       [[0.5, 0.5], [0.5, 0.5]],      # monaural:  c + (c+beat)
+                       [[1.0, 1.0], [0.0, 0.0]]])     # isochronic: c gated at beat
+
+
+def pack_layers(layers) -> np.ndarray:
+    """``[{"mode", "carrier", "beat", "gain"}, …]`` → float ``(n, 4)`` array."""
+    return np.array([(LAYER_MODES.index(l.get("mode", "binaural")),
+                      float(l["carrier"]), float(l["beat"]),
+                      float(l.get("gain", 1.0))) for l in layers],
+                    dtype=np.float64).reshape(-1, 4)
+
+
+class LayerBank:
+    """Any number of tone layers rendered as one 2-D batch per block.
+
+    Each layer is a row ``(mode, carrier, beat, gain)`` of a packed array
+    (see ``pack_layers``) and drives two oscillators: carrier and
+    carrier + beat (binaural: one per ear, monaural: summed in both ears),
+    or carrier and a beat-rate gate (isochronic).  All oscillators' phases
+    are evaluated together as a ``(2n, frames)`` array and a single matmul
+    folds them into the stereo block, so the per-block Python overhead is
+    the same for 1 layer or 64.  Frequencies and gains glide across the
+    block as in ``SineBank``; when the gains sum past 1 the mix is scaled
+    down so stacked layers do not clip.
+
+    Buffers are sized for *max_layers* (grown if a pack is larger) and
+    *blocksize*, and every per-block step is an ``out=`` ufunc over whole
+    contiguous rows or a matmul, so a steady-state block allocates
+    nothing.  To keep the rows contiguous, the first oscillators of all
+    layers come first and the second ones follow, isochronic layers
+    leading each half.  The layout and mix matrix are rebuilt only when a
+    different pack array is passed in; carrier and beat may be edited in
+    place.
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int,
+                 max_layers: int = MAX_LAYERS) -> None:
+        self.sample_rate = sample_rate
+        self._alloc(blocksize, max_layers)
+        self.reset()
+
+    def _alloc(self, frames: int, layers: int) -> None:
+        j, c = np.arange(1, frames + 1, dtype=np.float64), 2*layers
+        self._j     = j                                 # samples into the block
+        self._basis = np.stack((j, j * (j + 1) / (2*frames),    # Σ of a 0→1 glide
+                                np.ones(frames)))
+        self._unit = np.repeat((j / frames).astype(np.float32)[:, None], 2, axis=1)
+        self._ph   = np.empty((c, frames))
+        self._sin  = np.empty((c, frames), dtype=np.float32)
+        self._gate = np.empty((layers, frames), dtype=np.float32)
+        self._mix  = np.empty((frames, 2), dtype=np.float32)
+        old = getattr(self, "phase", None)              # per-oscillator state survives
+        for name, shape, dtype in (("phase", c, np.float64),   # radians
+                                   ("_freq", c, np.float64),   # Hz at end of last block
+                                   ("_fnew", c, np.float64), ("_tmpf", c, np.float64),
+                                   ("_coef", (c, 3), np.float64),
+                                   ("_w",    (c, 2), np.float32),   # weights of last block
+                                   ("_wnew", (c, 2), np.float32),
+                                   ("_wd",   (c, 2), np.float32),
+                                   ("_wbase", (c, 2), np.float32),  # mix at unit gain
+                                   ("_notiso", layers, np.float64)):
+            buf = np.zeros(shape, dtype)
+            if old is not None:
+                prev = getattr(self, name)
+                m = min(len(prev), len(buf)); buf[:m] = prev[:m]
+            setattr(self, name, buf)
+
+    def reset(self) -> None:
+        self.phase[:] = 0.0
+        self._layers = None
+        self._pack   = np.zeros((0, 4))                 # layers rendered, fading ones last
+        self._order  = np.zeros(0, dtype=np.intp)       # pack row of each oscillator row
+        self._live   = 0                                # pack rows still in the caller's pack
+        self._niso   = 0
+        self._fresh  = True                             # no gain glide from silence
+
+    def _repack(self, layers: np.ndarray) -> None:
+        """Lay out the oscillators for a new pack; removed layers fade out."""
+        old, live = len(self._pack), len(layers)
+        rows = np.empty(old, dtype=np.intp); rows[self._order] = np.arange(old)
+        tail = (not self._fresh and old > live
+                and (self._w[rows[live:]].any() or self._w[old + rows[live:]].any()))
+        t = old if tail else live
+        if t > len(self._notiso):
+            self._alloc(len(self._j), t)
+        pack = np.zeros((t, 4))
+        pack[:live] = layers
+        pack[live:, :3] = self._pack[live:t, :3]        # faded to silence this block
+        mode  = pack[:, 0].astype(np.intp)
+        iso   = mode == ISOCHRONIC
+        order = np.argsort(~iso, kind="stable")
+        new   = np.empty(t, dtype=np.intp); new[order] = np.arange(t)
+
+        # Carry phase / frequency / weights per layer; new layers start at zero
+        keep = min(old, t)
+        both = lambda r, n: np.concatenate((r[:keep], n + r[:keep]))
+        src, dst = both(rows, old), both(new, t)
+        for name in ("phase", "_freq", "_w"):
+            buf = getattr(self, name)
+            moved = buf[src]
+            buf[:2*t] = 0.0; buf[dst] = moved
+        total = float(np.abs(pack[:, 3]).sum())
+        g = pack[:, 3] / total if total > 1.0 else pack[:, 3]
+        w = _LAYER_MIX[mode] * g[:, None, None]
+        self._wbase[new], self._wbase[t + new] = w[:, 0], w[:, 1]
+        self._notiso[:t] = ~iso[order]
+        self._layers, self._pack, self._order = layers, pack, order
+        self._live, self._niso = live, int(iso.sum())
+        if t > keep:
+            self._freqs(layers)
+            added = np.concatenate((new[keep:], t + new[keep:]))
+            self._freq[added] = self._fnew[added]
+
+    def _freqs(self, layers: np.ndarray) -> None:
+        """Target Hz of every oscillator row into ``_fnew``."""
+        t, pack, order = len(self._pack), self._pack, self._order
+        pack[:self._live, 1:3] = layers[:, 1:3]
+        a, b = self._fnew[:t], self._fnew[t:2*t]
+        np.take(pack[:, 1], order, out=a)
+        np.multiply(a, self._notiso[:t], out=b)         # isochronic: gate at the beat
+        np.take(pack[:, 2], order, out=self._tmpf[:t])
+        b += self._tmpf[:t]
+
+    def render(self, out: np.ndarray, layers: np.ndarray, gain: float) -> None:
+        """Fill stereo ``out`` with every row of *layers*, times *gain*."""
+        frames = out.shape[0]
+        if frames != len(self._j):                      # host changed block size
+            self._alloc(frames, len(self._notiso))
+        if layers is not self._layers:
+            self._repack(layers)
+        t = len(self._pack); n = 2*t
+        if n == 0:
+            out.fill(0.0); self.reset()
+            return
+        self._freqs(layers)
+        w = self._wnew[:n]
+        np.multiply(self._wbase[:n], gain, out=w)
+        if self._fresh:
+            self._w[:n] = w; self._fresh = False
+
+        # Phase = f0·j + Δf·Σglide + carried phase, one matmul for every row
+        k, coef = 2*np.pi / self.sample_rate, self._coef[:n]
+        freq, f0, phase = self._fnew[:n], self._freq[:n], self.phase[:n]
+        np.multiply(f0, k, out=coef[:, 0])
+        np.subtract(freq, f0, out=coef[:, 1]); coef[:, 1] *= k
+        coef[:, 2] = phase
+        ph, sn = self._ph[:n], self._sin[:n]
+        np.matmul(coef, self._basis, out=ph)
+        np.remainder(ph[:, -1], 2*np.pi, out=phase)
+        f0[:] = freq
+        np.copyto(sn, ph, casting="same_kind")
+        np.sin(sn, out=sn)
+        if self._niso:                                  # soft-square beat gate
+            gate = self._gate[:self._niso]
+            np.multiply(sn[t:t + self._niso], 3.0, out=gate)
+            np.minimum(gate, 1.0, out=gate); np.maximum(gate, -1.0, out=gate)
+            gate *= 0.5; gate += 0.5
+            sn[:self._niso] *= gate
+
+        w0, wd = self._w[:n], self._wd[:n]
+        np.matmul(sn.T, w0, out=out)
+        np.subtract(w, w0, out=wd)
+        if wd.any():                                    # glide to the new gains
+            mix = self._mix
+            np.matmul(sn.T, wd, out=mix)
+            mix *= self._unit
+            out += mix
+            w0[:] = w
+        if t > self._live:                              # removed layers have faded
+            self._layers = None
+
+
+def layer_chunks(layers: np.ndarray, frames: int, sample_rate: int,
+                 chunk: int = EXPORT_CHUNK):
+    """Yield successive float32 ``(n, 2)`` blocks of constant *layers*."""
+    bank = LayerBank(sample_rate, chunk, max(len(layers), 1))
+    out  = np.empty((chunk, 2), dtype=np.float32)
+    for start in range(0, frames, chunk):
+        n = min(chunk, frames - start)
+        bank.render(out[:n], layers, 1.0)
+        yield out[:n]
+
+
+# ───── Looping clips ────────────────────────────────────────────────────────
+class ClipLoop:
+    """A mono clip looped gaplessly into stereo blocks, read in place.
+
+    The read pointer wraps every ``len(clip) - xfade`` frames: each pass
+    after the first starts with the clip's head fading in (sine) over its
+    last *xfade* frames fading out (cosine), an equal-power crossfade, so
+    the seam has no click or gap.  With *loop_min* > 0 playback fades out
+    and ends after that many minutes (``render`` returns False); 0 loops
+    until the source is removed.
+
+    The clip is only ever sliced, never copied, padded or tiled, and the
+    gain passed to ``render`` glides across the block as in ``SineBank``,
+    so the clip itself is never rescaled and an hour-long loop costs the
+    clip plus one block of scratch.
+    """
+
+    def __init__(self, clip: np.ndarray, sample_rate: int, blocksize: int,
+                 loop_min: float = 0.0, xfade_s: float = 0.05) -> None:
+        clip = np.asarray(clip, dtype=np.float32)
+        if clip.ndim > 1:                               # (n, 1) recordings are a view
+            clip = clip[:, 0] if clip.shape[1] == 1 else clip.mean(axis=1, dtype=np.float32)
+        self.clip  = clip
+        self.xfade = x = min(int(xfade_s * sample_rate), len(clip) // 4)
+        self.period = len(clip) - x
+        self.total  = int(loop_min * 60 * sample_rate) if loop_min > 0 else None
+        t = (np.arange(x) + 0.5) / max(x, 1)
+        self._fin  = np.sin(0.5*np.pi*t).astype(np.float32)
+        self._fout = np.cos(0.5*np.pi*t).astype(np.float32)
+        self.pos   = 0                                  # frames played so far
+        self._gain = None
+        self._resize(blocksize)
+
+    def _resize(self, frames: int) -> None:
+        self._unit = np.arange(1, frames + 1, dtype=np.float32) / frames
+        self._buf  = np.empty(frames, dtype=np.float32)
+        self._tmp  = np.empty(frames, dtype=np.float32)
+
+    def render(self, out: np.ndarray, gain: float) -> bool:
+        """Fill stereo ``out`` with the next block times *gain*; False at the end."""
+        frames = out.shape[0]
+        if frames != len(self._buf):                    # host changed block size
+            self._resize(frames)
+        left = frames if self.total is None else max(0, min(frames, self.total - self.pos))
+        if self.period <= 0 or left == 0:
+            out.fill(0.0)
+            return False
+        clip, p, x, buf = self.clip, self.period, self.xfade, self._buf
+        i, pos = 0, self.pos
+        while i < left:                                 # one slice per pass in the block
+            q = pos % p
+            n = min(left - i, p - q)
+            buf[i:i + n] = clip[q:q + n]
+            if pos >= p and q < x:                      # seam: head over the tail
+                m = min(n, x - q)
+                buf[i:i + m] *= self._fin[q:q + m]
+                np.multiply(clip[p + q:p + q + m], self._fout[q:q + m], out=self._tmp[:m])
+                buf[i:i + m] += self._tmp[:m]
+            i += n; pos += n
+        if self.total is not None and self.total - self.pos - left < x:
+            j0 = max(0, self.total - self.pos - x)      # final fade-out
+            r  = self.total - self.pos
+            buf[j0:left] *= self._fin[r - left:r - j0][::-1]
+        buf[left:] = 0.0
+        g0 = gain if self._gain is None else self._gain
+        if g0 == gain:
+            buf *= gain
+        else:
+            np.multiply(self._unit, gain - g0, out=self._tmp)
+            self._tmp += g0
+            buf *= self._tmp
+        out[:, 0] = buf; out[:, 1] = buf
+        self._gain = gain
+        self.pos = pos
+        return self.total is None or pos < self.total
+
+
+# ───── Callback instrumentation ─────────────────────────────────────────────
+STATUS_FLAGS = ("output_underflow", "output_overflow", "input_underflow",
+                "input_overflow", "priming_output")
+
+
+class CallbackStats:
+    """Run-time profile of one audio callback, updated from the audio thread.
+
+    Each call's duration is binned as a fraction of its block deadline
+    (``frames / sample_rate``) into a fixed log-spaced histogram, eight
+    bins per octave from 1/1024 of a deadline up to 4× — so recording is a
+    log and an integer add, and percentiles stay cheap to read at any
+    time (to within 9 %).  PortAudio status flags
+    are counted by name.  With ``alloc_every`` > 0 and tracemalloc
+    running, every n-th call also records the bytes it allocated.
+    """
+
+    BINS_PER_OCTAVE = 8
+    OCTAVES         = (-10, 2)                  # 2⁻¹⁰ … 2² deadlines
+
+    def __init__(self, sample_rate: int, alloc_every: int = 0) -> None:
+        self.sample_rate = sample_rate
+        self.alloc_every = alloc_every
+        self.reset()
+
+    def reset(self) -> None:
+        lo, hi = self.OCTAVES
+        self.hist     = np.zeros((hi - lo) * self.BINS_PER_OCTAVE + 1, np.int64)
+        self.calls    = 0
+        self.late     = 0                       # calls longer than their deadline
+        self.max_s    = 0.0
+        self.deadline = 0.0                     # seconds, last block
+        self.flags    = dict.fromkeys(STATUS_FLAGS, 0)
+        self.alloc_samples = self.alloc_max = self.alloc_total = 0
+
+    def begin(self):
+        """Call before the callback body; returns a token for ``record``."""
+        if (self.alloc_every and self.calls % self.alloc_every == 0
+                and tracemalloc.is_tracing()):
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    def record(self, seconds: float, frames: int, status=None, token=None) -> None:
+        deadline = frames / self.sample_rate
+        r = seconds / deadline
+        i = int((math.log2(r) - self.OCTAVES[0]) * self.BINS_PER_OCTAVE) if r > 0 else 0
+        self.hist[min(max(i, 0), len(self.hist) - 1)] += 1
+        self.calls += 1
+        self.deadline = deadline
+        if seconds > deadline:
+            self.late += 1
+        if seconds > self.max_s:
+            self.max_s = seconds
+        if status:
+            for flag in STATUS_FLAGS:
+                if getattr(status, flag, False):
+                    self.flags[flag] += 1
+        if token is not None:
+            used = tracemalloc.get_traced_memory()[1] - token
+            self.alloc_samples += 1; self.alloc_total += used
+            self.alloc_max = max(self.alloc_max, used)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (seconds) of the *q*-th percentile call duration."""
+        if not self.calls:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.hist), q / 100 * self.calls))
+        edge = 2 ** ((i + 1) / self.BINS_PER_OCTAVE + self.OCTAVES[0]) * self.deadline
+        return min(edge, self.max_s)
+
+    def summary(self) -> dict:
+        ms = lambda x: round(x * 1000, 3)
+        out = {"calls": self.calls, "deadline_ms": ms(self.deadline),
+               "p50_ms": ms(self.percentile(50)), "p95_ms": ms(self.percentile(95)),
+               "p99_ms": ms(self.percentile(99)), "max_ms": ms(self.max_s),
+               "late": self.late, **self.flags}
+        if self.alloc_samples:
+            out["alloc_avg_b"] = self.alloc_total // self.alloc_samples
+            out["alloc_max_b"] = self.alloc_max
+        return out
+
+
+# ───── Mixer ────────────────────────────────────────────────────────────────
+class _Source:
+    __slots__ = ("name", "render", "bus", "gain", "done", "fading", "stats")
+
+    def __init__(self, name, render, bus, gain, stats):
+        self.name, self.render, self.bus, self.gain = name, render, bus, gain
+        self.stats = stats
+        self.done = False
+        self.fading = False                  # removed: one last block down to 0
+
+
+class Mixer:
+    """A single stereo output stream shared by every tool in the process.
+
+    Sources are callables ``render(out, frames)`` that fill a float32
+    ``(frames, 2)`` block, exactly like a PortAudio callback; returning
+    False marks the source finished.  Each block every source renders into
+    its own row of a preallocated stack, and one ``einsum`` applies the
+    per-source × per-bus gains and sums the rows into ``outdata``.  Gain
+    changes glide across the block.
+
+    The source list is republished as a new tuple on every add/remove
+    (UI thread only), so the audio thread reads it without a lock.  Sources
+    that stay keep the gain they last played at; a new source fades in and
+    a removed (or replaced) one fades out over one block, so starting one
+    tool never dips another.  With
+    ``device=False`` no stream is opened and blocks are pulled by calling
+    ``render`` directly (benchmarks, offline use).
+
+    ``stats`` holds a ``CallbackStats`` for the whole stream callback
+    (with the device's status flags) and one per source name; see
+    ``stats_summary``.
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int, channels: int = 2,
+                 device: bool = True) -> None:
+        self.sample_rate = sample_rate
+        self.blocksize   = blocksize
+        self.channels    = channels
+        self.device      = device
+        self.bus_gains   = ParamStore()
+        self.stream      = None
+        self.stats       = {"stream": CallbackStats(sample_rate)}
+        self._publish([])
+        self._unit = np.arange(1, blocksize + 1, dtype=np.float32)[:, None] / blocksize
+        self._mix  = np.empty((blocksize, channels), dtype=np.float32)
+
+    # UI-thread API ------------------------------------------------------------
+    def add_source(self, name: str, render, bus: str = "main",
+                   gain: float = 1.0) -> None:
+        """Register (or replace) *name* and make sure the stream runs."""
+        stats = self.stats.setdefault(name, CallbackStats(self.sample_rate))
+        live = self._live()
+        self._publish([s for s in live if s.name != name]
+                      + [_Source(name, render, bus, gain, stats)],
+                      [s for s in live if s.name == name])
+        if self.stream is None and self.device:
+            self._open()
+
+    def remove_source(self, name: str) -> None:
+        live = self._live()
+        keep = [s for s in live if s.name != name]
+        if keep:
+            self._publish(keep, [s for s in live if s.name == name])
+        else:                                    # stream stops: nothing to fade under
+            self._publish([])
+            self._close()
+
+    def is_active(self, name: str) -> bool:
+        return any(s.name == name for s in self._live())
+
+    def _live(self) -> list:
+        return [s for s in self._state[0] if not s.done and not s.fading]
+
+    def set_bus_gain(self, bus: str, gain: float) -> None:
+        self.bus_gains.set(**{bus: gain})
+
+    def sample_allocations(self, every: int) -> None:
+        """Record heap use of every *every*-th stream callback (0 = off)."""
+        if every and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.stats["stream"].alloc_every = every
+
+    def stats_summary(self) -> dict:
+        return {name: st.summary() for name, st in self.stats.items()}
+
+    def _publish(self, sources: list, fading: list = ()) -> None:
+        """Swap in *sources*, plus *fading* ones playing a last block.
+
+        Sources carried over keep their last-block gain (read from the
+        state the audio thread may still be using: at worst one block
+        stale); new ones start from 0.
+        """
+        old = getattr(self, "_state", None)
+        before = {id(s): g for s, g in zip(old[0], old[2])} if old else {}
+        sources = list(sources) + list(fading)
+        n = len(sources)
+        last = np.array([before.get(id(s), 0.0) for s in sources], np.float32)
+        self._state = (tuple(sources),
+                       np.zeros((n, self.blocksize, self.channels), np.float32),
+                       last,                         # gains of the last block
+                       np.zeros(n, np.float32))      # gains of this block
+        for src in fading:                           # flagged once the new state is live
+            src.fading = True
+
+    def _open(self) -> None:
+        import sounddevice as sd
+
+        self.stream = sd.OutputStream(samplerate=self.sample_rate,
+                                      channels=self.channels,
+                                      blocksize=self.blocksize,
+                                      callback=self._callback)
+        self.stream.start()
+
+    def _close(self) -> None:
+        if self.stream is not None:
+            self.stream.stop(); self.stream.close()
+            self.stream = None
+
+    def close(self) -> None:
+        self._publish([])
+        self._close()
+
+    # Audio-thread side ----------------------------------------------------------
+    def _callback(self, outdata, frames, _time, status):
+        stats = self.stats["stream"]
+        token = stats.begin()
+        t0 = perf_counter()
+        self.render(outdata, frames)
+        stats.record(perf_counter() - t0, frames, status, token)
+
+    def render(self, outdata: np.ndarray, frames: int) -> None:
+        """Mix one block of every live source into *outdata*."""
+        sources, stack, last, gains = self._state
+        if not sources or frames > self.blocksize:
+            outdata.fill(0)
+            return
+        bus = self.bus_gains.snapshot()
+        for i, src in enumerate(sources):
+            if src.done:
+                stack[i].fill(0.0); gains[i] = 0.0
+                continue
+            t0 = perf_counter()
+            if src.render(stack[i, :frames], frames) is False or src.fading:
+                src.done = True
+            src.stats.record(perf_counter() - t0, frames)
+            gains[i] = 0.0 if src.fading else src.gain * bus.get(src.bus, 1.0)
+        block = stack[:, :frames]
+        np.einsum("i,ijk->jk", last, block, out=outdata)
+        if not np.array_equal(gains, last):          # glide to the new gains
+            np.subtract(gains, last, out=last)
+            mix = self._mix[:frames]
+            np.einsum("i,ijk->jk", last, block, out=mix)
+            if frames == self.blocksize:
+                mix *= self._unit
+            else:
+                mix *= self._unit[:frames] * (self.blocksize / frames)
+            outdata += mix
+            last[:] = gains
+
+
+_MIXER = None
+
+
+def shared_mixer(sample_rate: int = 44_100, blocksize: int = 1_024) -> Mixer:
+    """The process-wide mixer; created on first use."""
+    global _MIXER
+    if _MIXER is None:
+        _MIXER = Mixer(sample_rate, blocksize)
+    return _MIXER
+
+
+# ───── Offline rendering ────────────────────────────────────────────────────
+def binaural_chunks(carrier: float, beat: float, frames: int,
+                    sample_rate: int, chunk: int = EXPORT_CHUNK):
+    """Yield successive float32 ``(n, 2)`` blocks of a binaural tone.
+
+    The phase of every sample is computed from its absolute index rather
+    than accumulated, so the concatenated output is bit-identical for any
+    *chunk* size and the block edges are seamless.  The yielded array is a
+    reused buffer; consume (write) it before asking for the next one.
+    """
+    idx   = np.arange(chunk, dtype=np.float64)
+    cyc   = np.empty(chunk, dtype=np.float64)
+    whole = np.empty(chunk, dtype=np.float64)
+    out   = np.empty((chunk, 2), dtype=np.float32)
+    done  = 0
+    while done < frames:
+        n = min(chunk, frames - done)
+        for ch, f in enumerate((carrier, carrier + beat)):
+            c = cyc[:n]
+            np.add(idx[:n], done, out=c)
+            c *= f / sample_rate                # cycles since t = 0
+            np.floor(c, out=whole[:n])
+            c -= whole[:n]                      # keep the fraction only
+            c *= 2*np.pi
+            np.sin(c, out=out[:n, ch])
+        done += n
+        yield out[:n]
+
+
+def write_chunks(path: str, chunks, total: int, sample_rate: int,
+                 progress=None) -> bool:
+    """Stream stereo float blocks from *chunks* to an audio file at *path*.
+
+    The container follows the file extension (WAV, FLAC, OGG …) and is
+    written as 16-bit PCM where the format allows it.  ``progress(done,
+    total)`` is called after every block; if it returns False the export
+    stops, the partial file is removed and False is returned.
+    """
+    import soundfile as sf
+
+    fmt     = os.path.splitext(path)[1][1:].upper() or "WAV"
+    subtype = "PCM_16" if sf.check_format(fmt, "PCM_16") else None
+    done    = 0
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=2,
+                      format=fmt, subtype=subtype) as f:
+        for block in chunks:
+            f.write(block)
+            done += len(block)
+            if progress is not None and progress(done, total) is False:
+                break
+    if done < total:
+        os.remove(path)
+        return False
+    return True
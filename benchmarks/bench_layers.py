@@ -0,0 +1,112 @@
+"""
+bench_layers.py
+───────────────
+Scaling of the layered-tone callback: ``audio_engine.LayerBank`` (one 2-D
+batch per block) versus one ``SineBank`` per layer summed in a Python loop.
+
+Reports µs per block and the real-time factor (block duration / render
+time) for each layer count, with the modes cycling binaural → monaural →
+isochronic, plus the peak heap one LayerBank block takes under
+tracemalloc while the slider tone and volume move.  Exits non-zero if
+``--require`` layers do not render in real time on this core, or if a
+block takes more than ``--max-heap`` bytes of heap (a steady-state block
+should allocate no arrays, only a few small Python objects).
+
+    python benchmarks/bench_layers.py [--blocks 500] [--blocksize 1024] [--require 32]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from audio_engine import LAYER_MODES, LayerBank, SineBank, pack_layers   # noqa: E402
+
+SAMPLE_RATE = 44_100
+COUNTS      = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _layers(n):
+    return [{"mode": LAYER_MODES[i % 3], "carrier": 100.0 + 7*i,
+             "beat": 4.0 + i % 20, "gain": 1.0 / n} for i in range(n)]
+
+
+def _batched(n, blocksize):
+    bank, packed = LayerBank(SAMPLE_RATE, blocksize), pack_layers(_layers(n))
+    return lambda out: bank.render(out, packed, 0.5)
+
+
+def _looped(n, blocksize):
+    """Binaural layers only, one SineBank each: the naive alternative."""
+    banks = [(SineBank(2, SAMPLE_RATE, blocksize), l) for l in _layers(n)]
+    tmp = np.empty((blocksize, 2), dtype=np.float32)
+
+    def render(out):
+        out.fill(0.0)
+        for bank, l in banks:
+            bank.render(tmp, (l["carrier"], l["carrier"] + l["beat"]), l["gain"] * 0.5)
+            out += tmp
+    return render
+
+
+def _heap(n, blocksize, blocks=50):
+    """Peak heap (bytes) of one LayerBank block, worst over *blocks*."""
+    bank, packed = LayerBank(SAMPLE_RATE, blocksize), pack_layers(_layers(n))
+    out = np.zeros((blocksize, 2), dtype=np.float32)
+    bank.render(out, packed, 0.5)
+    worst = 0
+    tracemalloc.start()
+    for i in range(blocks):
+        packed[0, 1] = 100.0 + i % 5                        # slider tone moves
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        bank.render(out, packed, 0.5 + 0.01 * (i % 3))
+        worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return worst
+
+
+def _time(fn, blocks, blocksize):
+    out = np.zeros((blocksize, 2), dtype=np.float32)
+    for _ in range(20):                                   # warm-up
+        fn(out)
+    t0 = time.perf_counter()
+    for _ in range(blocks):
+        fn(out)
+    return (time.perf_counter() - t0) / blocks
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Layered-tone scaling benchmark")
+    ap.add_argument("--blocks", type=int, default=500)
+    ap.add_argument("--blocksize", type=int, default=1024)
+    ap.add_argument("--require", type=int, default=32,
+                    help="layer count that must run in real time")
+    ap.add_argument("--max-heap", type=int, default=4096,
+                    help="bytes of heap one LayerBank block may take")
+    args = ap.parse_args(argv)
+
+    block_s = args.blocksize / SAMPLE_RATE
+    status  = 0
+    print(f"{'layers':>6}{'batch µs':>10}{'× rt':>8}{'heap B':>8}{'loop µs':>10}{'× rt':>8}")
+    for n in sorted(set(COUNTS) | {args.require}):
+        tb = _time(_batched(n, args.blocksize), args.blocks, args.blocksize)
+        tl = _time(_looped(n, args.blocksize), args.blocks, args.blocksize)
+        heap = _heap(n, args.blocksize)
+        print(f"{n:>6}{tb*1e6:>10.1f}{block_s/tb:>8.1f}{heap:>8}"
+              f"{tl*1e6:>10.1f}{block_s/tl:>8.1f}")
+        if n == args.require and tb >= block_s:
+            status = 1
+            print(f"✗ {args.require} layers are slower than real time")
+        if heap > args.max_heap:
+            status = 1
+            print(f"✗ {n} layers: {heap} B of heap per block > {args.max_heap} B")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+bench_loop.py
+─────────────
+Memory, cost and seam quality of ``audio_engine.ClipLoop``, the looping
+affirmation player, over a long loop.
+
+• ClipLoop → the clip read in place, crossfaded at each wrap
+• wrap     → the same pointer wrapped with no crossfade
+• tiled    → the clip repeated out to the loop length before playback
+             (memory only, worked out rather than allocated)
+
+A 20 s clip (brown noise, so its ends never line up) is looped for
+``--minutes`` in 1024-frame blocks.  The script reports the peak traced
+memory and real-time factor of ClipLoop, the size a tiled copy would
+take, and the largest sample-to-sample step at the seams next to the
+largest step inside the clip; a click shows up as a seam step far above
+the clip's own.
+
+    python benchmarks/bench_loop.py [--minutes 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from audio_engine import ClipLoop   # noqa: E402
+
+SAMPLE_RATE = 44_100
+BLOCK       = 1_024
+
+
+def clip(seconds=20.0):
+    x = np.cumsum(np.random.default_rng(0).standard_normal(int(seconds * SAMPLE_RATE)))
+    x -= np.linspace(x[0], x[-1], len(x)) * 0.5     # ends still far apart
+    return (x / np.abs(x).max()).astype(np.float32)
+
+
+def play(loop, blocks, out):
+    for _ in range(blocks):
+        if not loop.render(out, 0.5):
+            break
+
+
+def seam_steps(data, loops=3):
+    """Largest step around the first *loops* seams: (ClipLoop, plain wrap)."""
+    lp = ClipLoop(data, SAMPLE_RATE, BLOCK)
+    out = np.zeros((BLOCK, 2), np.float32)
+    n = (lp.period * loops + lp.xfade) // BLOCK + 1
+    y = np.empty(n * BLOCK, np.float32)
+    for b in range(n):
+        lp.render(out, 1.0); y[b*BLOCK:(b + 1)*BLOCK] = out[:, 0]
+    near = lambda k: slice(k*lp.period - lp.xfade, k*lp.period + lp.xfade)
+    faded = max(np.abs(np.diff(y[near(k)])).max() for k in range(1, loops + 1))
+    return faded, abs(float(data[0] - data[-1]))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Looping clip benchmark")
+    ap.add_argument("--minutes", type=float, default=60.0)
+    args = ap.parse_args(argv)
+
+    data = clip()
+    out = np.zeros((BLOCK, 2), np.float32)
+    blocks = int(args.minutes * 60 * SAMPLE_RATE) // BLOCK + 1
+    lp = ClipLoop(data, SAMPLE_RATE, BLOCK, args.minutes)
+    t0 = time.perf_counter()
+    play(lp, blocks, out)
+    wall = time.perf_counter() - t0
+    ok = lp.pos == int(args.minutes * 60 * SAMPLE_RATE)
+
+    tracemalloc.start()
+    lp = ClipLoop(data, SAMPLE_RATE, BLOCK, args.minutes)
+    play(lp, blocks, out)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    mb = lambda b: b / 2**20
+    print(f"{args.minutes:g} min loop of a {len(data) / SAMPLE_RATE:g} s clip "
+          f"({mb(data.nbytes):.1f} MB):")
+    print(f"  ClipLoop  {args.minutes * 60 / wall:8.0f}× real time, peak {mb(peak):.3f} MB "
+          f"above the clip, stopped after {lp.pos / SAMPLE_RATE / 60:g} min")
+    print(f"  tiled     {mb(args.minutes * 60 * SAMPLE_RATE * 4):8.1f} MB for the repeated copy")
+    faded, wrapped = seam_steps(data)
+    inner = float(np.abs(np.diff(data)).max())
+    print(f"\nlargest step at the seam: {faded:.4f} crossfaded, {wrapped:.4f} plain wrap "
+          f"(inside the clip: {inner:.4f})")
+    return 0 if ok and peak < 2**20 and faded <= 2 * inner else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+bench_noise.py
+──────────────
+Benchmark and sanity check for ``noise.ColouredNoise``.
+
+For each colour it reports the per-block cost (ns/frame) at the start and
+after a long run, which must stay flat because the filter state is only a
+few samples, plus the fitted spectral slope over 100 Hz–10 kHz (dB/octave)
+and the RMS level.  Exits non-zero if a slope is off by more than
+``--tolerance`` dB/octave.
+
+    python benchmarks/bench_noise.py [--blocks 2000] [--blocksize 1024]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from noise import COLOURS, ColouredNoise   # noqa: E402
+
+SAMPLE_RATE = 44_100
+EXPECTED    = {"white": 0.0, "pink": -3.0, "brown": -6.0}   # dB/octave
+
+
+def _time(noise, out, blocks):
+    t0 = time.perf_counter()
+    for _ in range(blocks):
+        noise.render(out, 0.5)
+    return (time.perf_counter() - t0) / (blocks * out.shape[0]) * 1e9
+
+
+def _slope(noise, blocksize, seconds=20.0):
+    """Fitted dB/octave of an averaged periodogram over 100 Hz–10 kHz."""
+    seg = 8192
+    out = np.empty((blocksize, 2), dtype=np.float32)
+    sig = np.empty(int(seconds * SAMPLE_RATE) // blocksize * blocksize)
+    for i in range(0, len(sig), blocksize):
+        noise.render(out, 1.0)
+        sig[i:i + blocksize] = out[:, 0]
+    segs = sig[:len(sig) // seg * seg].reshape(-1, seg) * np.hanning(seg)
+    psd  = np.mean(np.abs(np.fft.rfft(segs, axis=1)) ** 2, axis=0)
+    f    = np.fft.rfftfreq(seg, 1 / SAMPLE_RATE)
+    band = (f >= 100) & (f <= 10_000)
+    slope = np.polyfit(np.log2(f[band]), 10*np.log10(psd[band]), 1)[0]
+    return float(slope), float(sig[SAMPLE_RATE:].std())
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Coloured-noise benchmark")
+    ap.add_argument("--blocks", type=int, default=2000)
+    ap.add_argument("--blocksize", type=int, default=1024)
+    ap.add_argument("--tolerance", type=float, default=0.5)
+    args = ap.parse_args(argv)
+
+    status = 0
+    print(f"{'colour':<8}{'ns/frame':>10}{'late ns/f':>11}{'dB/oct':>9}{'rms':>8}")
+    for colour in COLOURS:
+        noise = ColouredNoise(colour, 2, seed=0)
+        out = np.empty((args.blocksize, 2), dtype=np.float32)
+        _time(noise, out, 50)                              # warm-up
+        early = _time(noise, out, args.blocks)
+        _time(noise, out, 10 * args.blocks)                # a long session later
+        late = _time(noise, out, args.blocks)
+        slope, rms = _slope(ColouredNoise(colour, 2, seed=1), args.blocksize)
+        ok = abs(slope - EXPECTED[colour]) <= args.tolerance
+        status |= not ok
+        print(f"{colour:<8}{early:>10.2f}{late:>11.2f}{slope:>9.2f}{rms:>8.3f}"
+              + ("" if ok else "  ✗ slope"))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+bench_oscillator.py
+───────────────────
+Microbenchmark for the binaural audio callback: the original per-block
+NumPy code versus ``audio_engine.SineBank``.
+
+Reports ns/frame and the heap traffic of one steady-state block (peak
+bytes allocated while it runs, as seen by tracemalloc).  The engine's
+residue is the handful of view/float objects Python itself creates.
+
+    python benchmarks/bench_oscillator.py [--blocks 2000] [--blocksize 1024]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from audio_engine import SineBank   # noqa: E402
+
+SAMPLE_RATE = 44_100
+
+
+class LegacyBinaural:
+    """The pre-engine ``BinauralApp._audio_callback``, verbatim."""
+
+    def __init__(self):
+        self.left_phase = self.right_phase = 0.0
+
+    def __call__(self, outdata, frames, c, b, v):
+        d1   = 2*np.pi*c / SAMPLE_RATE
+        d2   = 2*np.pi*(c+b) / SAMPLE_RATE
+        idx  = np.arange(frames)
+        p1   = self.left_phase  + d1*idx
+        p2   = self.right_phase + d2*idx
+        outdata[:] = (np.stack([np.sin(p1), np.sin(p2)], axis=-1) * v).astype(np.float32)
+        self.left_phase  = (p1[-1] + d1) % (2*np.pi)
+        self.right_phase = (p2[-1] + d2) % (2*np.pi)
+
+
+def _engine(blocksize):
+    bank = SineBank(2, SAMPLE_RATE, blocksize)
+    return lambda out, frames, c, b, v: bank.render(out, (c, c + b), v)
+
+
+def _time(fn, blocks, blocksize):
+    out = np.zeros((blocksize, 2), dtype=np.float32)
+    for _ in range(50):                                   # warm-up
+        fn(out, blocksize, 200.0, 10.0, 0.5)
+    t0 = time.perf_counter()
+    for i in range(blocks):
+        fn(out, blocksize, 200.0 + (i & 1), 10.0, 0.5)     # keep glides active
+    return (time.perf_counter() - t0) / (blocks * blocksize) * 1e9
+
+
+def _heap(fn, blocksize):
+    out = np.zeros((blocksize, 2), dtype=np.float32)
+    fn(out, blocksize, 200.0, 10.0, 0.5)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn(out, blocksize, 201.0, 10.0, 0.5)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Binaural callback microbenchmark")
+    ap.add_argument("--blocks", type=int, default=2000)
+    ap.add_argument("--blocksize", type=int, default=1024)
+    args = ap.parse_args(argv)
+
+    print(f"{'callback':<10}{'ns/frame':>10}{'peak B/block':>14}")
+    for name, fn in (("legacy", LegacyBinaural()), ("engine", _engine(args.blocksize))):
+        ns = _time(fn, args.blocks, args.blocksize)
+        peak = _heap(fn, args.blocksize)
+        print(f"{name:<10}{ns:>10.2f}{peak:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+bench_preset_store.py
+─────────────────────
+Load time and per-save latency of the SQLite ``PresetStore`` versus the
+old whole-file ``json.dump`` rewrite, for large preset libraries.
+
+    python benchmarks/bench_preset_store.py [--sizes 10000 50000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from presets import PresetStore   # noqa: E402
+
+
+def _library(n):
+    return {f"Preset {i}": {"carrier": 100.0 + i % 300, "beat": 0.5 + i % 40,
+                            "desc": f"Generated preset number {i}."}
+            for i in range(n)}
+
+
+def _ms(fn, repeat=20):
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def bench(n, tmp):
+    lib = _library(n)
+    js  = os.path.join(tmp, f"lib{n}.json")
+    db  = os.path.join(tmp, f"lib{n}.db")
+    with open(js, "w") as f:
+        json.dump(lib, f, indent=4)
+
+    t0 = time.perf_counter()
+    store = PresetStore(db, legacy_json=js)               # one-time migration
+    migrate = (time.perf_counter() - t0) * 1000
+
+    def json_load(_):
+        with open(js) as f:
+            json.load(f)
+
+    def json_save(i):
+        lib[f"New {i}"] = {"carrier": 200.0, "beat": 6.0, "desc": ""}
+        with open(js, "w") as f:
+            json.dump(lib, f, indent=4)
+
+    res = {
+        "json load ms":  _ms(json_load, 5),
+        "json save ms":  _ms(json_save, 5),
+        "db load ms":    _ms(lambda _: store.all(), 5),
+        "db save ms":    _ms(lambda i: store.put(f"New {i}", {"carrier": 200.0,
+                                                              "beat": 6.0})),
+        "db delete ms":  _ms(lambda i: store.delete(f"New {i}")),
+        "migration ms":  migrate,
+    }
+    store.close()
+    return res
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Preset storage benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    args = ap.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            print(f"── {n} presets")
+            for k, v in bench(n, tmp).items():
+                print(f"  {k:<14}{v:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
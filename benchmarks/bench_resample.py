@@ -0,0 +1,103 @@
+"""
+bench_resample.py
+─────────────────
+Throughput and alias rejection of ``resampling.resample`` against the two
+methods it replaced:
+
+• nearest  → rounded indices (the old ``ResonatorApp.import_sample``)
+• interp   → ``np.interp`` on the whole signal (the old affirmation path)
+• sinc     → ``resampling.resample`` (polyphase windowed sinc)
+• stream   → ``resampling.Resampler`` fed 4096-sample blocks
+
+For each rate pair the script prints Msamples/s of input and the level of
+the worst alias or image left in the output.  The probe is a full-scale
+tone that should not survive the conversion (above the output Nyquist
+when downsampling, the spectral image of an audible tone when upsampling),
+so the level is the rejection in dB; lower is better.  The 23.5 kHz probe
+is just above the output Nyquist, where the downsampling filter's stop
+band starts.  Exits non-zero if ``sinc`` or ``stream`` leaves any probe
+above ``--max-leak`` (the filter's documented −80 dB).
+
+    python benchmarks/bench_resample.py [--seconds 30] [--max-leak -80]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from resampling import Resampler, resample   # noqa: E402
+
+DST = 44_100
+# (source rate, probe tone Hz, what the probe measures)
+PAIRS = ((22_050, 5_000.0, "image of 5 kHz"),
+         (24_000, 7_000.0, "image of 7 kHz"),
+         (48_000, 23_500.0, "23.5 kHz alias"),
+         (96_000, 30_000.0, "30 kHz alias"))
+
+
+def nearest(sig, sr, dst):
+    idx = np.round(np.arange(int(len(sig) * dst / sr)) * sr / dst).astype(int)
+    return sig[np.minimum(idx, len(sig) - 1)]
+
+
+def interp(sig, sr, dst):
+    n = int(len(sig) * dst / sr)
+    return np.interp(np.linspace(0, len(sig), n, endpoint=False), np.arange(len(sig)), sig)
+
+
+def stream(sig, sr, dst, block=4096):
+    r = Resampler(sr, dst)
+    parts = [r.process(sig[i:i + block]) for i in range(0, len(sig), block)]
+    parts.append(r.flush())
+    return np.concatenate(parts)
+
+
+METHODS = {"nearest": nearest, "interp": interp, "sinc": resample, "stream": stream}
+
+
+def leak_db(out: np.ndarray, keep_hz: float | None) -> float:
+    """Strongest spectral peak in *out* (dB re. full-scale sine), ignoring
+    the pass-band tone at *keep_hz* when there is one."""
+    seg = out[len(out) // 4: len(out) // 4 + DST]           # 1 s, clear of the edges
+    spec = np.abs(np.fft.rfft(seg * np.hanning(len(seg)))) / (len(seg) / 4)
+    if keep_hz is not None:
+        k = int(round(keep_hz * len(seg) / DST))
+        spec[max(0, k - 8):k + 9] = 0
+    return 20 * np.log10(spec.max() + 1e-12)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Resampler throughput and aliasing")
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--max-leak", type=float, default=-80.0,
+                    help="dB the sinc methods must reject every probe by")
+    args = ap.parse_args(argv)
+
+    print(f"{'pair':<16}{'probe':<16}" + "".join(f"{m:>18}" for m in METHODS))
+    fails = []
+    for sr, hz, label in PAIRS:
+        t = np.arange(int(args.seconds * sr)) / sr
+        sig = np.sin(2*np.pi*hz*t).astype(np.float32)
+        keep = hz if hz < DST / 2 and sr < DST else None   # upsampling keeps the tone
+        cells = []
+        for name, fn in METHODS.items():
+            fn(sig[:sr], sr, DST)                            # warm-up / filter design
+            t0 = time.perf_counter()
+            out = fn(sig, sr, DST)
+            ms = len(sig) / (time.perf_counter() - t0) / 1e6
+            leak = leak_db(out, keep)
+            cells.append(f"{ms:7.1f} M/s {leak:5.0f} dB")
+            if name in ("sinc", "stream") and leak > args.max_leak:
+                fails.append(f"{name} {sr} → {DST}: {label} at {leak:.0f} dB > {args.max_leak:g} dB")
+        print(f"{sr // 1000:>3}k → {DST / 1000:g}k  {label:<16}" + "".join(f"{c:>18}" for c in cells))
+    for msg in fails:
+        print(f"✗ {msg}")
+    return 1 if fails else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+bench_resonance_log.py
+──────────────────────
+Cost of saving a tone and refreshing the Lab with N tones already saved.
+
+• json list → the old scheme: re-read and re-write the whole
+              ``user_resonance.json`` per save, re-parse it per refresh
+• log       → ``presets.ResonanceLog``: one appended line per save, only
+              the new bytes parsed per refresh
+
+Also checks that concurrent savers lose nothing: ``--writers`` processes
+append ``--saves`` tones each to one log at the same time, and the count
+read back must match.  Last, an old ``user_resonance.json`` in each
+legacy format (a list of tones, a single ``{"personal_resonance": …}``
+object, compact and indented) must survive migration on the first save.
+
+    python benchmarks/bench_resonance_log.py [--marks 100 1000 10000] [--writers 4]
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from presets import ResonanceLog, resonance_presets   # noqa: E402
+
+
+def _tone(i):
+    return {"hz": round(100 + i % 300 + i / 1e4, 2), "timestamp": "2026-01-01T00:00:00"}
+
+
+def _json_save(path, entry):
+    with open(path) as f:
+        data = json.load(f)
+    data.append(entry)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _json_refresh(path):
+    with open(path) as f:
+        return resonance_presets(json.load(f))
+
+
+def _timed(fn, repeat=20):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def _writer(path, saves, wid):
+    log = ResonanceLog(path, legacy="")
+    for i in range(saves):
+        log.append([{"hz": 100.0 + wid, "n": i}])
+
+
+def migrates(tmp, legacy, indent):
+    """True when *legacy* plus one saved tone are all read back after migration."""
+    path, old = os.path.join(tmp, "migrated.jsonl"), os.path.join(tmp, "old.json")
+    for p in (path, old):
+        if os.path.exists(p):
+            os.remove(p)
+    with open(old, "w") as f:
+        json.dump(legacy, f, indent=indent)
+    want = (legacy if isinstance(legacy, list) else [legacy]) + [{"hz": 120.0}]
+    before = ResonanceLog(path, legacy=old).records()
+    ResonanceLog(path, legacy=old).append(want[-1:])
+    return before == want[:-1] and ResonanceLog(path, legacy="").records() == want
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Resonance log benchmark")
+    ap.add_argument("--marks", type=int, nargs="+", default=[100, 1000, 10_000])
+    ap.add_argument("--writers", type=int, default=4)
+    ap.add_argument("--saves", type=int, default=250)
+    args = ap.parse_args(argv)
+
+    print(f"{'marks':>7}{'json save':>12}{'json refresh':>14}{'log save':>11}{'log refresh':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.marks:
+            tones = [_tone(i) for i in range(n)]
+            js, lg = os.path.join(tmp, f"{n}.json"), os.path.join(tmp, f"{n}.jsonl")
+            with open(js, "w") as f:
+                json.dump(tones, f, indent=2)
+            log = ResonanceLog(lg, legacy="")
+            log.append(tones)
+            log.records()
+
+            j_save = _timed(lambda: _json_save(js, _tone(0)))
+            j_read = _timed(lambda: _json_refresh(js))
+
+            def log_save_and_refresh():
+                log.append([_tone(0)])
+                tones = log.records()
+                resonance_presets(tones[-1:], start=len(tones))
+            l_both = _timed(log_save_and_refresh)
+            l_save = _timed(lambda: log.append([_tone(0)]))
+            print(f"{n:>7}{j_save:>10.2f}ms{j_read:>12.2f}ms{l_save:>9.2f}ms"
+                  f"{l_both - l_save:>11.2f}ms")
+
+        path = os.path.join(tmp, "shared.jsonl")
+        procs = [mp.Process(target=_writer, args=(path, args.saves, w))
+                 for w in range(args.writers)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        got = len(ResonanceLog(path, legacy="").records())
+        want = args.writers * args.saves
+        print(f"\n{args.writers} writers × {args.saves} saves: {got}/{want} tones kept "
+              f"in {time.perf_counter() - t0:.2f} s")
+
+        migrated = True
+        for name, legacy in (("list", [_tone(1), _tone(2)]),
+                             ("object", {"personal_resonance": 128.5})):
+            for indent in (None, 2):
+                ok = migrates(tmp, legacy, indent)
+                migrated &= ok
+                print(f"legacy {name}, indent={indent}: {'migrated' if ok else 'LOST'}")
+    return 0 if got == want and migrated else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
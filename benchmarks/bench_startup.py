@@ -0,0 +1,114 @@
+"""
+bench_startup.py
+────────────────
+Cold-start benchmark for the three entry points.  Every sample is a fresh
+interpreter started in a scratch directory (so no preset DB or affirmation
+folder is reused).
+
+• import  → ``python -X importtime``: total import time of the script
+            module and of its heaviest direct imports
+• window  → wall time from process spawn until the app's first window is
+            mapped (needs a display; skipped with a note otherwise)
+
+Medians over ``--repeat`` runs are printed.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--top 6]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+ENTRY_POINTS = (("BinauralLab", "BinauralApp"),
+                ("consciousness_resonator", "ResonatorApp"),
+                ("affirmation_loop", "AffirmationApp"))
+
+_WINDOW = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import tkinter as tk
+from {module} import {cls}
+root = tk.Tk()
+app = {cls}(root)
+while not root.winfo_viewable():
+    root.update()
+root.update()
+print(json.dumps({{"ready": time.time()}}), flush=True)
+root.destroy()
+"""
+
+
+def _run(args, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+
+def import_times(module: str, cwd: str) -> dict[str, float]:
+    """Cumulative seconds of *module* and of each module it imports directly."""
+    res = _run(["-X", "importtime", "-c", f"import {module}"], cwd)
+    if res.returncode:
+        raise RuntimeError(res.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in res.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        cum, name = parts[1].strip(), parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if not cum.isdigit():
+            continue                             # header line
+        if depth == 1 or name.strip() == module:
+            times[name.strip()] = int(cum) / 1e6
+    return times
+
+
+def window_time(module: str, cls: str, cwd: str) -> float | None:
+    """Seconds from spawn to first mapped window, or None without a display."""
+    t0 = time.time()
+    res = _run(["-c", _WINDOW.format(root=ROOT, module=module, cls=cls)], cwd)
+    for line in res.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)["ready"] - t0
+    return None
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Cold-start benchmark")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=6,
+                    help="heaviest direct imports listed per script")
+    args = ap.parse_args(argv)
+
+    for module, cls in ENTRY_POINTS:
+        runs, windows = [], []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as cwd:
+                try:
+                    runs.append(import_times(module, cwd))
+                except RuntimeError as e:
+                    print(f"{module}: import failed: {e}")
+                    break
+                windows.append(window_time(module, cls, cwd))
+        if not runs:
+            continue
+        names = set().union(*runs)
+        med = {n: statistics.median(r.get(n, 0.0) for r in runs) for n in names}
+        shown = [w for w in windows if w is not None]
+        window = (f"{statistics.median(shown)*1000:.0f} ms to first window"
+                  if shown else "no display: window time skipped")
+        print(f"\n{module}.py  import {med.get(module, 0.0)*1000:.0f} ms · {window}")
+        for name in sorted(names - {module}, key=med.get, reverse=True)[:args.top]:
+            print(f"    {name:<28}{med[name]*1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+bench_suite.py
+──────────────
+Regression benchmark for the DSP hot paths.  Needs no audio device or
+display: the app callbacks are called unbound on a stand-in ``self`` and
+the mixer runs with ``device=False``.
+
+Cases
+─────
+• callback.binaural.b<N>  BinauralApp._audio_callback, slider tone
+• callback.noise.b1024    … with a pink noise layer
+• callback.layers.b1024   … with 8 stacked layers
+• callback.session.b1024  … driven by sessions/relax_to_sleep.json
+• callback.resonator.b<N> ResonatorApp._audio_callback
+• callback.affirmation.b1024 AffirmationApp._play_callback, a looping clip
+• mixer.3src.b1024        shared mixer summing binaural + resonator + voice
+• export.tone.60s / 3600s export_audio path: binaural_chunks → 16-bit WAV
+• export.session.600s     a session timeline streamed to WAV
+• analyse.hum             hum_analysis.analyse_hum on 3 s (was _analyse)
+• affirmation.resample    TTS-rate audio → 44.1 kHz (gain is now per block)
+
+Each case reports real-time factor (audio seconds per wall second),
+throughput (Mframes/s) and peak traced memory (MB, separate pass).
+
+    python benchmarks/bench_suite.py                       # table
+    python benchmarks/bench_suite.py --json out.json       # machine-readable
+    python benchmarks/bench_suite.py --check               # gate on thresholds.json
+    python benchmarks/bench_suite.py --baseline old.json --max-slowdown 0.25
+
+``--check`` fails a case whose real-time factor is below its floor or
+whose peak memory is above its ceiling in ``thresholds.json``;
+``--baseline`` fails a case that got more than ``--max-slowdown`` slower
+than in an earlier ``--json`` report.  The exit status is the number of
+failures.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+sys.path.insert(0, ROOT)
+from audio_engine import (ClipLoop, LayerBank, Mixer, ParamStore, SineBank,   # noqa: E402
+                          binaural_chunks, pack_layers, write_chunks)
+from affirmation_loop import AffirmationApp                          # noqa: E402
+from BinauralLab import BinauralApp                                  # noqa: E402
+from consciousness_resonator import ResonatorApp                     # noqa: E402
+from hum_analysis import FFT_SECONDS, analyse_hum                    # noqa: E402
+from noise import ColouredNoise                                      # noqa: E402
+from presets import DEFAULT_PRESETS                                  # noqa: E402
+from resampling import resample                                      # noqa: E402
+from session import Session                                          # noqa: E402
+
+SAMPLE_RATE = 44_100
+BLOCKSIZES  = (64, 256, 1024, 4096)
+CALLBACK_S  = 20.0                         # audio simulated per callback case
+SESSION     = os.path.join(ROOT, "sessions", "relax_to_sleep.json")
+THRESHOLDS  = os.path.join(HERE, "thresholds.json")
+
+
+# ───── Stand-ins for the apps' audio state ──────────────────────────────────
+def _binaural_self(layers=(), noise=None, session=None):
+    params = ParamStore(carrier=200.0, beat=10.0, volume=0.5, noise=0.3)
+    return SimpleNamespace(
+        session=session, session_pos=0, params=params, noise=noise,
+        tones=LayerBank(SAMPLE_RATE, 1024),
+        layer_pack=pack_layers([{"carrier": 200.0, "beat": 10.0}] + list(layers)))
+
+
+def _resonator_self():
+    return SimpleNamespace(params=ParamStore(freq=128.0, vol=0.3),
+                           osc=SineBank(1, SAMPLE_RATE, 1024))
+
+
+def _affirmation_self(seconds=10):
+    voice = np.random.default_rng(0).standard_normal(seconds * SAMPLE_RATE).astype(np.float32)
+    return SimpleNamespace(params=ParamStore(db=-15.0, loop_min=0.0),
+                           loop=ClipLoop(voice, SAMPLE_RATE, 1024))
+
+
+def _blocks(callback, state, blocksize, channels=2, seconds=CALLBACK_S):
+    out, n = np.zeros((blocksize, channels), np.float32), int(seconds * SAMPLE_RATE) // blocksize
+
+    def run():
+        for _ in range(n):
+            callback(state, out, blocksize)
+    return run, n * blocksize
+
+
+# ───── Cases: name → setup() returning (run, frames) ────────────────────────
+def _cases(tmp):
+    cases = {}
+    for bs in BLOCKSIZES:
+        cases[f"callback.binaural.b{bs}"] = (
+            lambda bs=bs: _blocks(BinauralApp._audio_callback, _binaural_self(), bs))
+        cases[f"callback.resonator.b{bs}"] = (
+            lambda bs=bs: _blocks(ResonatorApp._audio_callback, _resonator_self(), bs))
+    cases["callback.affirmation.b1024"] = lambda: _blocks(
+        AffirmationApp._play_callback, _affirmation_self(), 1024)
+    cases["callback.noise.b1024"] = lambda: _blocks(
+        BinauralApp._audio_callback,
+        _binaural_self(noise=ColouredNoise("pink", 2, seed=0)), 1024)
+    cases["callback.layers.b1024"] = lambda: _blocks(
+        BinauralApp._audio_callback,
+        _binaural_self(layers=[{"mode": m, "carrier": 100.0 + 20*i, "beat": 4.0 + i,
+                                "gain": 0.5}
+                               for i, m in enumerate(["binaural", "monaural",
+                                                      "isochronic"] * 2 + ["binaural"])]),
+        1024)
+    cases["callback.session.b1024"] = lambda: _blocks(
+        BinauralApp._audio_callback,
+        _binaural_self(session=Session.load(SESSION, SAMPLE_RATE, DEFAULT_PRESETS)), 1024)
+
+    def mixer():
+        mix = Mixer(SAMPLE_RATE, 1024, device=False)
+        lab, res, voice = _binaural_self(), _resonator_self(), _affirmation_self()
+        speak = lambda o, f: AffirmationApp._play_callback(voice, o, f)
+        mix.add_source("binaural", lambda o, f: BinauralApp._audio_callback(lab, o, f),
+                       bus="binaural")
+        mix.add_source("resonator", lambda o, f: ResonatorApp._audio_callback(res, o, f),
+                       bus="resonator")
+        mix.add_source("affirmation", speak, bus="voice", gain=0.2)
+        return _blocks(lambda _, out, frames: mix.render(out, frames), None, 1024)
+    cases["mixer.3src.b1024"] = mixer
+
+    def export(seconds, session=False):
+        def setup():
+            path = os.path.join(tmp, "export.wav")
+            total = int(seconds * SAMPLE_RATE)
+            if session:
+                s = Session.load(SESSION, SAMPLE_RATE, DEFAULT_PRESETS)
+
+                def chunks(chunk=65_536):             # Session.chunks, cut short
+                    buf = np.empty((chunk, 2), np.float32)
+                    for start in range(0, total, chunk):
+                        n = min(chunk, total - start)
+                        s.render(buf[:n], start)
+                        yield buf[:n]
+            else:
+                chunks = lambda: binaural_chunks(200.0, 10.0, total, SAMPLE_RATE)
+
+            def run():
+                write_chunks(path, chunks(), total, SAMPLE_RATE)
+                os.remove(path)
+            return run, total
+        return setup
+    cases["export.tone.60s"]      = export(60)
+    cases["export.tone.3600s"]    = export(3600)
+    cases["export.session.600s"]  = export(600, session=True)
+
+    def hum():
+        t = np.arange(int(FFT_SECONDS * SAMPLE_RATE)) / SAMPLE_RATE
+        rng = np.random.default_rng(0)
+        sig = np.sin(2*np.pi*132.7*t) + 0.3*rng.standard_normal(len(t))
+
+        def run():
+            for _ in range(10):
+                analyse_hum(sig, SAMPLE_RATE)
+        return run, 10 * len(t)
+    cases["analyse.hum"] = hum
+
+    def affirmation():
+        tts = np.random.default_rng(0).standard_normal(30 * 22_050)
+
+        def run():
+            resample(tts, 22_050, SAMPLE_RATE).astype("float32")
+        return run, int(30 * SAMPLE_RATE)
+    cases["affirmation.resample"] = affirmation
+    return cases
+
+
+# ───── Measurement ──────────────────────────────────────────────────────────
+def measure(setup, repeat: int) -> dict:
+    run, frames = setup()
+    run()                                              # warm-up
+    best = min(_timed(run) for _ in range(repeat))
+    run, _ = setup()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    audio_s = frames / SAMPLE_RATE
+    return {"audio_s": round(audio_s, 3), "wall_s": round(best, 5),
+            "rt_factor": round(audio_s / best, 1),
+            "mframes_per_s": round(frames / best / 1e6, 2),
+            "peak_mb": round(peak / 2**20, 2)}
+
+
+def _timed(run):
+    t0 = time.perf_counter(); run()
+    return time.perf_counter() - t0
+
+
+def check(results: dict, thresholds: dict, baseline: dict | None,
+          max_slowdown: float) -> list[str]:
+    fails = []
+    for name, r in results.items():
+        floor = thresholds.get("min_rt_factor", {}).get(name)
+        if floor is not None and r["rt_factor"] < floor:
+            fails.append(f"{name}: {r['rt_factor']}× real time < floor {floor}×")
+        ceil = thresholds.get("max_peak_mb", {}).get(name)
+        if ceil is not None and r["peak_mb"] > ceil:
+            fails.append(f"{name}: peak {r['peak_mb']} MB > {ceil} MB")
+        old = (baseline or {}).get(name)
+        if old and r["rt_factor"] < old["rt_factor"] * (1 - max_slowdown):
+            fails.append(f"{name}: {r['rt_factor']}× vs {old['rt_factor']}× in baseline")
+    return fails
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="DSP hot-path benchmark suite")
+    ap.add_argument("cases", nargs="*", help="case names or globs (default: all)")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs; best is kept")
+    ap.add_argument("--json", metavar="PATH", help="write the report here ('-' = stdout)")
+    ap.add_argument("--check", action="store_true", help=f"gate on {THRESHOLDS}")
+    ap.add_argument("--thresholds", default=THRESHOLDS)
+    ap.add_argument("--baseline", metavar="PATH", help="earlier --json report")
+    ap.add_argument("--max-slowdown", type=float, default=0.25)
+    args = ap.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, setup in _cases(tmp).items():
+            if args.cases and not any(fnmatch.fnmatchcase(name, p) for p in args.cases):
+                continue
+            results[name] = r = measure(setup, args.repeat)
+            if args.json != "-":
+                print(f"{name:<26}{r['rt_factor']:>10.1f}× rt{r['mframes_per_s']:>9.2f} Mf/s"
+                      f"{r['peak_mb']:>9.2f} MB")
+
+    thresholds = {}
+    if args.check:
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    fails = check(results, thresholds, baseline, args.max_slowdown)
+
+    report = {"created": datetime.now().isoformat(),
+              "python": platform.python_version(), "numpy": np.__version__,
+              "machine": platform.machine(), "sample_rate": SAMPLE_RATE,
+              "results": results, "failures": fails}
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2); print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    for msg in fails:
+        print(f"✗ {msg}", file=sys.stderr)
+    return len(fails)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+bench_tts_cache.py
+──────────────────
+What ▶ Preview costs in TTS mode, with and without ``tts_cache``.
+
+• miss → ``Synthesiser.request`` on new text: worker start-up (first miss
+         only), speech synthesis, resampling and the cache write.  Needs
+         pyttsx3 and a speech engine; skipped with a note otherwise.
+• hit  → the same request once cached: one 16-bit WAV read, for clips
+         of several lengths
+• evict → the LRU scan after a store, with ``--clips`` clips on disk
+
+All of it runs off the Tk thread in the app; the numbers say how long the
+user waits between pressing ▶ Preview and hearing the voice.
+
+    python benchmarks/bench_tts_cache.py [--clips 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from tts_cache import Synthesiser, TTSCache, tts_key   # noqa: E402
+
+SAMPLE_RATE = 44_100
+TEXT = ("I am more than my physical body. Because I am more than physical matter, "
+        "I can perceive that which is greater than the physical world.")
+
+
+def _ms(fn, repeat=10):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="TTS cache benchmark")
+    ap.add_argument("--clips", type=int, default=200, help="clips on disk for the evict test")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(os.path.join(tmp, "tts"))
+        synth = Synthesiser(cache, SAMPLE_RATE)
+        try:
+            for label in ("first miss", "miss"):
+                t0 = time.perf_counter()
+                audio, info = synth.request(f"{TEXT} ({label})").result(timeout=120)
+                print(f"{label:<12}{(time.perf_counter() - t0) * 1000:9.1f} ms  "
+                      f"(synthesis {info['synth_s'] * 1000:.1f} ms, "
+                      f"{len(audio) / SAMPLE_RATE:.1f} s of speech)")
+            print(f"{'hit':<12}{_ms(lambda: synth.request(f'{TEXT} (miss)').result()):9.1f} ms")
+        except Exception as e:
+            print(f"miss        skipped: {type(e).__name__}: {e}")
+        finally:
+            synth.close()
+
+        for seconds in (5, 30, 120):
+            key = tts_key(f"clip {seconds}")
+            cache.store(key, np.zeros(seconds * SAMPLE_RATE, np.float32), SAMPLE_RATE)
+            print(f"hit {seconds:>4} s{_ms(lambda: cache.load(key)):11.2f} ms")
+
+        small = np.zeros(SAMPLE_RATE // 10, np.float32)
+        for i in range(args.clips):
+            cache.store(tts_key(f"fill {i}"), small, SAMPLE_RATE)
+        cache.max_bytes = sum(c[1] for c in cache.clips()) // 2
+        t0 = time.perf_counter()
+        dropped = cache.evict()
+        print(f"evict       {(time.perf_counter() - t0) * 1000:9.2f} ms "
+              f"({dropped} of {dropped + len(cache.clips())} clips dropped)")
+        print(cache.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+binaural_cli.py
+───────────────
+Command-line tools for Binaural Lab that run without a display or audio
+device.  Only numpy (plus soundfile for file I/O) is needed.
+
+    python binaural_cli.py render OUT.wav --preset "Focus 10" --seconds 600
+    python binaural_cli.py render OUT.flac --carrier 200 --beat 6 --seconds 60
+    python binaural_cli.py render OUT.wav --session sessions/relax_to_sleep.json --noise pink
+    python binaural_cli.py analyse hum1.wav hum2.flac
+    python binaural_cli.py analyse recordings/ --jobs 4 --save
+    python binaural_cli.py batch [PRESET|GLOB ...] --seconds 600 --out renders/
+
+`render` writes one tone or session timeline, `analyse` prints the ranked stable peaks of
+each hum recording (directories are expanded, files analysed across a process pool;
+`--save` appends each file's strongest peak to the `user_resonance.jsonl` log), and
+`batch` renders every matching preset (default: the whole library, including Personal
+Resonance entries) across a process pool and writes `manifest.json` next to the audio
+files with the render time of each.
+`--noise white|pink|brown` mixes a noise bed under the beat at `--noise-level`.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from audio_engine import binaural_chunks, write_chunks
+from hum_analysis import analyse_file
+from noise import COLOURS, add_noise
+from presets import PRESETS_DB, USER_RES_FILE, load_presets, save_resonances
+from session import Session
+
+SAMPLE_RATE = 44_100
+NOISE_LEVEL = 0.3
+AUDIO_EXTS  = (".wav", ".flac", ".ogg", ".mp3")
+
+
+def _write(path, chunks, total, noise=None, level=NOISE_LEVEL):
+    if noise:
+        chunks = add_noise(chunks, noise, level)
+    return write_chunks(path, chunks, total, SAMPLE_RATE)
+
+
+# ───── Batch rendering ──────────────────────────────────────────────────────
+def select_presets(library: dict, patterns: list[str]) -> list[str]:
+    """Names in *library* matching any exact name or glob in *patterns*."""
+    if not patterns:
+        return list(library)
+    return [name for name in library
+            if any(name == p or fnmatch.fnmatchcase(name, p) for p in patterns)]
+
+
+def safe_filename(name: str) -> str:
+    return re.sub(r"[^\w\-]+", "_", name).strip("_") or "preset"
+
+
+def _render_one(job: dict) -> dict:
+    """Worker: render one preset and return its manifest entry."""
+    t0 = time.perf_counter()
+    total  = int(job["sample_rate"] * job["seconds"])
+    chunks = binaural_chunks(job["carrier"], job["beat"], total, job["sample_rate"])
+    if job["noise"]:
+        chunks = add_noise(chunks, job["noise"], job["noise_level"])
+    write_chunks(job["path"], chunks, total, job["sample_rate"])
+    elapsed = time.perf_counter() - t0
+    return {**job, "path": os.path.basename(job["path"]),
+            "render_s": round(elapsed, 4),
+            "realtime_x": round(job["seconds"] / elapsed, 1) if elapsed else None}
+
+
+def batch_render(names: list[str], library: dict, seconds: float, out_dir: str,
+                 fmt: str = "wav", jobs: int | None = None,
+                 sample_rate: int = SAMPLE_RATE, noise: str | None = None,
+                 noise_level: float = NOISE_LEVEL, log=print) -> dict:
+    """Render *names* to *out_dir* in parallel and write ``manifest.json``."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(names)))
+    work = [{"preset": n,
+             "carrier": float(library[n]["carrier"]),
+             "beat": float(library[n]["beat"]),
+             "seconds": seconds,
+             "sample_rate": sample_rate,
+             "noise": noise,
+             "noise_level": noise_level if noise else None,
+             "path": os.path.join(out_dir, f"{safe_filename(n)}.{fmt}")}
+            for n in names]
+
+    t0 = time.perf_counter()
+    entries = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for fut in as_completed([pool.submit(_render_one, j) for j in work]):
+            rec = fut.result()
+            entries.append(rec)
+            log(f"{rec['preset']:<28} {rec['render_s']:8.2f} s  "
+                f"({rec['realtime_x']}× real time)")
+    wall = time.perf_counter() - t0
+
+    order = {n: i for i, n in enumerate(names)}
+    entries.sort(key=lambda r: order[r["preset"]])
+    manifest = {"created": datetime.now().isoformat(),
+                "jobs": jobs, "seconds": seconds, "format": fmt,
+                "wall_s": round(wall, 4),
+                "audio_s_per_wall_s": round(seconds * len(entries) / wall, 1)
+                                      if wall else None,
+                "files": entries}
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ───── Batch analysis ───────────────────────────────────────────────────────
+def hum_files(paths: list[str]) -> list[str]:
+    """*paths* with each directory replaced by the audio files in it."""
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(os.path.join(p, f) for f in os.listdir(p)
+                            if f.lower().endswith(AUDIO_EXTS))
+        else:
+            files.append(p)
+    return files
+
+
+def _analyse_one(job: tuple[str, int]) -> dict:
+    """Worker: ranked peaks of one recording, or the error it raised."""
+    path, top = job
+    t0 = time.perf_counter()
+    try:
+        return {"path": path, "peaks": analyse_file(path, top),
+                "analyse_s": round(time.perf_counter() - t0, 4)}
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def batch_analyse(paths: list[str], top: int = 5, jobs: int | None = None,
+                  log=print) -> list[dict]:
+    """Analyse *paths* in parallel; results come back in input order."""
+    if not paths:
+        return []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futs = [pool.submit(_analyse_one, (p, top)) for p in paths]
+        for fut in as_completed(futs):
+            rec = fut.result()
+            results.append(rec)
+            log(_describe(rec))
+    order = {p: i for i, p in enumerate(paths)}
+    results.sort(key=lambda r: order[r["path"]])
+    return results
+
+
+def _describe(rec: dict) -> str:
+    if "error" in rec:
+        return f"{rec['path']}: error: {rec['error']}"
+    if not rec["peaks"]:
+        return f"{rec['path']}: no clear hum"
+    best, rest = rec["peaks"][0], rec["peaks"][1:]
+    line = (f"{rec['path']}: {best['hz']:.2f} Hz "
+            f"(+{best['db']:.1f} dB, in {best['stability']:.0%} of segments)")
+    if rest:
+        line += "  also " + ", ".join(f"{p['hz']:.2f}" + (f" (×{p['harmonic']})"
+                                                           if p.get("harmonic") else "")
+                                      for p in rest)
+    return line
+
+
+# ───── Entry point ──────────────────────────────────────────────────────────
+def _cmd_render(args) -> int:
+    if args.session:
+        library = load_presets(args.presets_db, args.resonance_file)
+        try:
+            session = Session.load(args.session, SAMPLE_RATE, library)
+        except (OSError, ValueError) as e:
+            print(f"{args.session}: {e}", file=sys.stderr)
+            return 1
+        _write(args.out, session.chunks(), session.frames, args.noise, args.noise_level)
+        print(f"{len(session.segments)} segments, {session.seconds / 60:.1f} min "
+              f"→ {args.out}")
+        return 0
+    if args.seconds is None:
+        print("Give --seconds.", file=sys.stderr)
+        return 1
+    if args.preset:
+        library = load_presets(args.presets_db, args.resonance_file)
+        if args.preset not in library:
+            print(f"Unknown preset '{args.preset}'.", file=sys.stderr)
+            return 1
+        carrier = float(library[args.preset]["carrier"])
+        beat    = float(library[args.preset]["beat"])
+    elif args.carrier is not None:
+        carrier, beat = args.carrier, args.beat
+    else:
+        print("Give --preset or --carrier.", file=sys.stderr)
+        return 1
+    total = int(SAMPLE_RATE * args.seconds)
+    _write(args.out, binaural_chunks(carrier, beat, total, SAMPLE_RATE), total,
+           args.noise, args.noise_level)
+    print(f"{carrier:.3f} Hz / {beat:.3f} Hz × {args.seconds:g} s → {args.out}")
+    return 0
+
+
+def _cmd_analyse(args) -> int:
+    paths = hum_files(args.files)
+    if not paths:
+        print("No recordings found.", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    results = batch_analyse(paths, args.top, args.jobs,
+                            log=lambda line: print(line, flush=True))
+    found = [r for r in results if r.get("peaks")]
+    print(f"{len(found)}/{len(results)} recordings with a clear hum "
+          f"in {time.perf_counter() - t0:.2f} s")
+    if args.save and found:
+        now = datetime.now().isoformat()
+        save_resonances([{"hz": round(r["peaks"][0]["hz"], 2), "timestamp": now,
+                          "source": os.path.abspath(r["path"]),
+                          "peaks": [{**p, **{k: round(p[k], 3)
+                                             for k in ("hz", "db", "stability")}}
+                                    for p in r["peaks"]]}
+                         for r in found], args.resonance_file)
+        print(f"{len(found)} tones → {args.resonance_file}")
+    return int(any("error" in r for r in results))
+
+
+def _cmd_batch(args) -> int:
+    library = load_presets(args.presets_db, args.resonance_file)
+    names = select_presets(library, args.presets)
+    if not names:
+        print("No presets match.", file=sys.stderr)
+        return 1
+    m = batch_render(names, library, args.seconds, args.out,
+                     fmt=args.format, jobs=args.jobs,
+                     noise=args.noise, noise_level=args.noise_level)
+    print(f"{len(m['files'])} files in {m['wall_s']:.2f} s on {m['jobs']} "
+          f"workers → {os.path.join(args.out, 'manifest.json')}")
+    return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="binaural_cli",
+                                 description="Headless Binaural Lab tools.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("render", help="render one session to an audio file")
+    r.add_argument("out", help="output file (.wav / .flac / .ogg)")
+    r.add_argument("--preset")
+    r.add_argument("--carrier", type=float)
+    r.add_argument("--beat", type=float, default=0.0)
+    r.add_argument("--seconds", type=float)
+    r.add_argument("--session", help="session timeline JSON (sets the length)")
+    r.add_argument("--noise", choices=COLOURS, help="noise bed under the beat")
+    r.add_argument("--noise-level", type=float, default=NOISE_LEVEL)
+    r.add_argument("--presets-db", default=PRESETS_DB)
+    r.add_argument("--resonance-file", default=USER_RES_FILE)
+    r.set_defaults(func=_cmd_render)
+
+    a = sub.add_parser("analyse", help="suggest the resonance of hum recordings")
+    a.add_argument("files", nargs="+", help="recordings or directories of them")
+    a.add_argument("--top", type=int, default=5, help="peaks listed per file")
+    a.add_argument("--jobs", type=int, default=None,
+                   help="worker processes (default: CPU count)")
+    a.add_argument("--save", action="store_true",
+                   help="append each file's strongest peak to --resonance-file")
+    a.add_argument("--resonance-file", default=USER_RES_FILE)
+    a.set_defaults(func=_cmd_analyse)
+
+    b = sub.add_parser("batch", help="render presets to audio files")
+    b.add_argument("presets", nargs="*",
+                   help="preset names or globs (default: all)")
+    b.add_argument("--seconds", type=float, required=True)
+    b.add_argument("--out", default="renders")
+    b.add_argument("--format", default="wav", choices=("wav", "flac", "ogg"))
+    b.add_argument("--jobs", type=int, default=None,
+                   help="worker processes (default: CPU count)")
+    b.add_argument("--noise", choices=COLOURS, help="noise bed under the beat")
+    b.add_argument("--noise-level", type=float, default=NOISE_LEVEL)
+    b.add_argument("--presets-db", default=PRESETS_DB)
+    b.add_argument("--resonance-file", default=USER_RES_FILE)
+    b.set_defaults(func=_cmd_batch)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,41 +8,43 @@ Key features
 ────────────
 • Adjustable sine-tone playback (60 – 400 Hz) with volume control
 • Fine-tune buttons and live Hz read-out
-• ⭐ Mark Tone  → appends {"hz", "timestamp"} to user_resonance.json
-• 🎙️  Import Hum Sample (wav / mp3 / ogg / flac) → FFT analysis, suggested Hz
+• ⭐ Mark Tone  → appends {"hz", "timestamp"} to the user_resonance.jsonl log
+• 🎙️  Import Hum Sample (wav / mp3 / ogg / flac) → whole-file spectrum, suggested Hz
 • 🎤  Record & Suggest (3 s mic grab)           → same analysis routine
+• 🎧  Live Track → continuous estimate with a stability bar while you hum
 • Breathing blue ring + solid white core graphic
   – ring radius pulses and scales with the current frequency
-Launch from Binaural Beat Lab’s ✨ button or run directly:
+Opens as a window inside Binaural Beat Lab (✨ button), or run directly:
     python consciousness_resonator.py
+Saving a tone fires ``<<ResonancesChanged>>`` on the Tk root so an open
+Lab refreshes its Personal Resonance presets at once.
 """
 
-import json
-import os
+import threading
 from datetime import datetime
 
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+from audio_engine import ParamStore, SineBank, bind_var, shared_mixer
+from hum_analysis import (FREQ_MIN, FREQ_MAX, FFT_SECONDS, PitchTracker,
+                          analyse_file, analyse_hum)
+from presets import USER_RES_FILE, ResonanceLog
+
 # ───── Configuration ────────────────────────────────────────────────────────
 SAMPLE_RATE        = 44_100                # Hz
 BLOCKSIZE          = 1_024
-JSON_FILE          = "user_resonance.json" # saved tones list
+RES_LOG            = USER_RES_FILE         # saved tones log
 
-FREQ_MIN           = 60.0                  # Hz
-FREQ_MAX           = 400.0                 # Hz
 DEFAULT_FREQ       = 128.0                 # Hz
 DEFAULT_VOL        = 0.30                  # 0-1
-
-FFT_SECONDS        = 3.0                   # analysed duration
-PEAK_THRESHOLD_DB  = 10                    # min dB above noise floor
+LIVE_POLL_MS       = 150                   # live read-out refresh
+STABLE_ENOUGH      = 0.75                  # stability needed to apply a live Hz
 
 # ───── Application ──────────────────────────────────────────────────────────
 class ResonatorApp:
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk | tk.Toplevel) -> None:
         self.master = master
         master.title("Consciousness Resonator")
         master.geometry("520x560")
@@ -50,8 +52,18 @@ class ResonatorApp:
         # State
         self.freq_var = tk.DoubleVar(value=DEFAULT_FREQ)
         self.vol_var  = tk.DoubleVar(value=DEFAULT_VOL)
-        self.stream   = None
-        self.phase    = 0.0
+        self.mixer    = shared_mixer(SAMPLE_RATE, BLOCKSIZE)
+        self.osc      = SineBank(1, SAMPLE_RATE, BLOCKSIZE)
+        self.res_log  = ResonanceLog(RES_LOG)
+        self.tracker  = None       # PitchTracker while the mic is open
+        self.in_stream = None
+        self.live     = False
+        self._rec_job = self._live_job = self._import_job = None
+
+        # Snapshot read by the audio thread (no Tcl calls in the callback)
+        self.params = ParamStore()
+        bind_var(self.params, "freq", self.freq_var)
+        bind_var(self.params, "vol",  self.vol_var)
 
         # Build UI & start animation
         self._build_ui()
@@ -99,8 +111,12 @@ class ResonatorApp:
         io = ttk.Frame(self.master); io.pack(**pad)
         ttk.Button(io, text="🎙️  Import Hum Sample",
                 command=self.import_sample).pack(side="left", padx=6)
-        ttk.Button(io, text="🎤 Record & Suggest (3 s)",
-                command=self.record_sample).pack(side="left", padx=6)
+        self.rec_btn = ttk.Button(io, text="🎤 Record & Suggest (3 s)",
+                                  command=self.record_sample)
+        self.rec_btn.pack(side="left", padx=6)
+        self.live_btn = ttk.Button(io, text="🎧 Live Track",
+                                   command=self.toggle_live)
+        self.live_btn.pack(side="left", padx=6)
 
         # Suggestion label
         self.suggest = ttk.Label(self.master, text="",
@@ -108,6 +124,14 @@ class ResonatorApp:
                                 font=("Arial", 11, "bold"))
         self.suggest.pack()
 
+        # Live stability bar + analysis cost read-out
+        live = ttk.Frame(self.master); live.pack()
+        self.stability = ttk.Progressbar(live, length=160, maximum=1.0)
+        self.stability.pack(side="left", padx=6)
+        self.live_info = ttk.Label(live, text="", foreground="gray",
+                                   font=("Arial", 8))
+        self.live_info.pack(side="left")
+
         # Breathing graphic canvas
         self.canvas = tk.Canvas(self.master, width=380, height=180,
                                 highlightthickness=0)
@@ -125,30 +149,27 @@ class ResonatorApp:
 
     # ─── Tone playback ──────────────────────────────────────────────────────
     def toggle_tone(self) -> None:
-        if self.stream:
+        if self.playing:
             self._stop_stream(); self.start_btn.config(text="▶ Start Tone")
         else:
             self._start_stream(); self.start_btn.config(text="■ Stop Tone")
 
+    @property
+    def playing(self) -> bool:
+        return self.mixer.is_active("resonator")
+
     def _start_stream(self) -> None:
-        self.stream = sd.OutputStream(samplerate=SAMPLE_RATE, channels=1,
-                                    blocksize=BLOCKSIZE,
-                                    callback=self._audio_callback)
-        self.stream.start()
+        self.osc.reset()                       # the last run has faded out by now
+        self.mixer.add_source("resonator", self._audio_callback, bus="resonator")
 
     def _stop_stream(self) -> None:
-        if self.stream:
-            self.stream.stop(); self.stream.close()
-        self.stream = None; self.phase = 0.0
+        # The mixer plays one more block, fading out: leave the oscillator be
+        self.mixer.remove_source("resonator")
 
     def _audio_callback(self, out, frames, *_):
-        f   = self.freq_var.get()
-        vol = self.vol_var.get()
-        omega = 2*np.pi*f / SAMPLE_RATE
-        idx   = np.arange(frames)
-        ph    = self.phase + omega*idx
-        out[:, 0] = (np.sin(ph) * vol).astype(np.float32)
-        self.phase = (ph[-1] + omega) % (2*np.pi)
+        p = self.params.snapshot()
+        self.osc.render(out[:, :1], (p["freq"],), p["vol"])
+        out[:, 1] = out[:, 0]                  # mono tone on both channels
 
     # ─── Breathing / frequency-responsive animation ────────────────────────
     def _animate(self) -> None:
@@ -167,7 +188,7 @@ class ResonatorApp:
         self.canvas.coords(self.ring, cx-r_out, cy-r_out, cx+r_out, cy+r_out)
         self.canvas.coords(self.core, cx-r_in,  cy-r_in,  cx+r_in,  cy+r_in)
 
-        self.master.after(30, self._animate)
+        self._anim_job = self.master.after(30, self._animate)
 
     # ─── UI helpers ─────────────────────────────────────────────────────────
     def _nudge(self, delta: float) -> None:
@@ -183,53 +204,17 @@ class ResonatorApp:
         entry = {"hz": round(self.freq_var.get(), 2),
                 "timestamp": datetime.now().isoformat()}
 
-        # Append to list (create file if missing)
-        data: list[dict] = []
-        if os.path.exists(JSON_FILE):
-            try:
-                with open(JSON_FILE, "r") as f:
-                    data = json.load(f)
-                if isinstance(data, dict):            # legacy single object
-                    data = [data]
-            except Exception:
-                data = []
-        data.append(entry)
-
+        # One atomic line appended; only new lines are read back for the count
         try:
-            with open(JSON_FILE, "w") as f:
-                json.dump(data, f, indent=2)
+            self.res_log.append([entry])
+            total = len(self.res_log.records())
+            self.master.nametowidget(".").event_generate("<<ResonancesChanged>>")
             messagebox.showinfo("Saved",
                 f"Resonance {entry['hz']} Hz added."
-                f"\nTotal saved tones: {len(data)}")
-        except IOError as e:
+                f"\nTotal saved tones: {total}")
+        except OSError as e:
             messagebox.showerror("Error", str(e))
 
-    # ─── FFT analysis helpers ───────────────────────────────────────────────
-    def _analyse(self, sig: np.ndarray) -> float | None:
-        """Return dominant hum in Hz or None."""
-        if sig.ndim > 1:
-            sig = sig.mean(axis=1)
-        sig = sig[: int(FFT_SECONDS*SAMPLE_RATE)]
-        sig = np.pad(sig, (0, max(0, int(FFT_SECONDS*SAMPLE_RATE) - len(sig))))
-        sig *= np.hanning(len(sig))
-
-        spec  = np.fft.rfft(sig)
-        freqs = np.fft.rfftfreq(len(sig), 1/SAMPLE_RATE)
-        mags  = 20*np.log10(np.abs(spec) + 1e-8)
-
-        band = (freqs >= FREQ_MIN) & (freqs <= FREQ_MAX)
-        if not band.any():
-            return None
-
-        pk_i   = np.argmax(mags[band])
-        pk_f   = freqs[band][pk_i]
-        pk_db  = mags[band][pk_i]
-        noise  = np.median(mags[band])
-
-        if pk_db - noise < PEAK_THRESHOLD_DB:
-            return None
-        return float(pk_f)
-
     # ─── Import saved hum sample ────────────────────────────────────────────
     def import_sample(self) -> None:
         fname = filedialog.askopenfilename(
@@ -237,49 +222,87 @@ class ResonatorApp:
             filetypes=[("Audio files", "*.wav *.flac *.ogg *.mp3"),
                     ("All files",   "*.*")]
         )
-        if not fname:
+        if not fname or self._import_job is not None:
             return
-        try:
-            sig, sr = sf.read(fname, always_2d=False)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            return
-
-        # Resample to 44.1 k if needed (quick & dirty)
-        if sr != SAMPLE_RATE:
-            ratio   = SAMPLE_RATE / sr
-            indices = np.round(np.arange(0, len(sig) * ratio) / ratio).astype(int)
-            indices = np.clip(indices, 0, len(sig) - 1)
-            sig     = sig[indices]
+        self.suggest.config(text="Analysing…")
+        # The whole file is streamed through analyse_file; keep the UI live
+        result = {}
 
-        peak = self._analyse(sig)
-        if peak is None:
+        def work():
+            try:
+                result["peaks"] = analyse_file(fname)
+            except Exception as e:
+                result["error"] = e
+        threading.Thread(target=work, daemon=True).start()
+        self._import_job = self.master.after(100, lambda: self._finish_import(result))
+
+    def _finish_import(self, result: dict) -> None:
+        if not result:
+            self._import_job = self.master.after(100, lambda: self._finish_import(result))
+            return
+        self._import_job = None
+        self.suggest.config(text="")
+        if "error" in result:
+            messagebox.showerror("Error", str(result["error"]))
+            return
+        peaks = result["peaks"]
+        if not peaks:
             messagebox.showinfo("Analysis", "No clear hum found in that file.")
             return
 
+        peak = peaks[0]["hz"]
         self.freq_var.set(round(peak, 2)); self._update_readout()
-        self.suggest.config(text=f"Suggested ≈ {peak:.2f} Hz")
+        also = ", ".join(f"{p['hz']:.1f}" for p in peaks[1:3])
+        self.suggest.config(text=f"Suggested ≈ {peak:.2f} Hz"
+                                 + (f"  (also {also})" if also else ""))
+
+    # ─── Microphone (non-blocking) ──────────────────────────────────────────
+    def _open_mic(self) -> bool:
+        """Start an InputStream feeding a fresh PitchTracker."""
+        try:
+            import sounddevice as sd        # first use only; keeps start-up light
+            self.tracker = PitchTracker(SAMPLE_RATE)
+            self.in_stream = sd.InputStream(
+                samplerate=SAMPLE_RATE, channels=1, blocksize=BLOCKSIZE,
+                dtype="float32",
+                callback=lambda ind, *_: self.tracker.push(ind[:, 0]))
+            self.in_stream.start()
+        except Exception as e:
+            self.tracker = self.in_stream = None
+            messagebox.showerror("Mic error", str(e))
+            return False
+        return True
+
+    def _close_mic(self) -> None:
+        if self.in_stream is not None:
+            self.in_stream.stop(); self.in_stream.close()
+            self.in_stream = None
+        if self.tracker is not None:
+            self.tracker.stop()
 
     # ─── Record live hum sample ─────────────────────────────────────────────
     def record_sample(self) -> None:
-        was_playing = self.stream is not None
+        if self.live or self.in_stream is not None:
+            return
+        was_playing = self.playing
         if was_playing:
             self._stop_stream()
-
-        self.suggest.config(text="Recording…")
-        self.master.update_idletasks()
-
-        try:
-            sig = sd.rec(int(FFT_SECONDS * SAMPLE_RATE), samplerate=SAMPLE_RATE,
-                        channels=1, dtype='float32')
-            sd.wait()
-            sig = sig.flatten()
-        except Exception as e:
-            messagebox.showerror("Mic error", str(e))
-            self.suggest.config(text="")
+        if not self._open_mic():
             return
-
-        peak = self._analyse(sig)
+        self.rec_btn.state(["disabled"])
+        self.suggest.config(text="Recording…")
+        # The UI keeps running; collect FFT_SECONDS of audio, then analyse
+        self._rec_job = self.master.after(int(FFT_SECONDS * 1000) + 100,
+                                          lambda: self._finish_record(was_playing))
+
+    def _finish_record(self, was_playing: bool) -> None:
+        self._rec_job = None
+        self._close_mic()                  # no more writes: the window is whole
+        sig = self.tracker.recent(FFT_SECONDS)
+        self.tracker = None
+        self.rec_btn.state(["!disabled"])
+
+        peak = analyse_hum(sig, SAMPLE_RATE)
         if peak is None:
             self.suggest.config(text="")
             messagebox.showinfo("Analysis",
@@ -291,9 +314,58 @@ class ResonatorApp:
         if was_playing:
             self._start_stream()
 
+    # ─── Live pitch tracking ────────────────────────────────────────────────
+    def toggle_live(self) -> None:
+        if self.live:
+            self._stop_live()
+            return
+        if self.in_stream is not None or not self._open_mic():
+            return
+        self.tracker.start()
+        self.live = True
+        self.live_btn.config(text="■ Stop Live")
+        self.suggest.config(text="Listening…")
+        self._poll_live()
+
+    def _poll_live(self) -> None:
+        if not self.live:
+            return
+        res = self.tracker.result
+        if res is not None:
+            self.stability["value"] = res["stability"]
+            if res["hz"] is not None:
+                self.suggest.config(text=f"Live ≈ {res['hz']:.2f} Hz "
+                                         f"({res['stability']:.0%} stable)")
+            t = self.tracker.timing_summary()
+            self.live_info.config(
+                text=f"hop {t['hop_ms']:.0f} ms · latency {t['latency_ms']:.1f} ms "
+                     f"· cpu {t['cpu_ms']:.1f} ms")
+        self._live_job = self.master.after(LIVE_POLL_MS, self._poll_live)
+
+    def _stop_live(self) -> None:
+        self.live = False
+        self.master.after_cancel(self._live_job)
+        res = self.tracker.result
+        self._close_mic(); self.tracker = None
+        self.live_btn.config(text="🎧 Live Track")
+        self.stability["value"] = 0; self.live_info.config(text="")
+        # Keep a settled estimate; a wandering one is just discarded
+        if res and res["hz"] is not None and res["stability"] >= STABLE_ENOUGH:
+            self.freq_var.set(round(res["hz"], 2)); self._update_readout()
+            self.suggest.config(text=f"Suggested ≈ {res['hz']:.2f} Hz")
+        else:
+            self.suggest.config(text="")
+
     # ─── Clean-up ───────────────────────────────────────────────────────────
     def on_close(self) -> None:
+        if self.live:
+            self._stop_live()
+        for job in (self._rec_job, self._import_job):
+            if job is not None:
+                self.master.after_cancel(job)
+        self._close_mic()
         self._stop_stream()
+        self.master.after_cancel(self._anim_job)
         self.master.destroy()
 
 # ───── Main entry ───────────────────────────────────────────────────────────
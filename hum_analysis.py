@@ -0,0 +1,423 @@
+"""
+hum_analysis.py
+───────────────
+Hum / voice analysis behind the Consciousness Resonator, usable without Tk
+or an audio device.
+
+• analyse_hum()  → hum fundamental (Hz) of a signal, or None
+• yin()          → batched YIN pitch of many frames in one NumPy pass
+• analyse_file() → ranked stable hum peaks of a whole recording (streamed)
+• PitchTracker   → live estimates from a microphone feed, off the UI thread
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+FREQ_MIN           = 60.0                  # Hz
+FREQ_MAX           = 400.0                 # Hz
+FFT_SECONDS        = 3.0                   # analysed duration
+PEAK_THRESHOLD_DB  = 10                    # min dB above noise floor
+
+LIVE_WINDOW_S      = 1.0                   # analysed span per live estimate
+LIVE_HOP_S         = 0.2                   # new audio between estimates
+STABLE_CENTS       = 25                    # estimates this close count as agreeing
+
+YIN_WINDOW_S       = 0.025                 # integration window of one YIN frame
+YIN_HOP_S          = 0.010                 # step between YIN frames
+YIN_THRESHOLD      = 0.15                  # first dip below this is the period
+YIN_VOICED         = 0.35                  # frames dipping below this are voiced
+YIN_MIN_VOICED     = 0.3                   # voiced share needed to trust an f0
+HARMONICS          = 4                     # partials searched to refine an f0
+HARMONIC_TOL       = 0.03                  # relative width of each search
+SUBHARMONIC_DB     = 15                    # level a sub-harmonic of the peak must clear
+YIN_BLOCK          = 64                    # frames per batched pass (bounds memory)
+F0_CENTS           = 10                    # f0 histogram resolution in analyse_file
+
+WELCH_OVERLAP      = 0.5                   # segment overlap in analyse_file
+PEAK_STABILITY     = 0.6                   # share of segments a ranked peak must recur in
+
+
+def analyse_hum(sig: np.ndarray, sample_rate: int) -> float | None:
+    """Return the hum fundamental in Hz or None.
+
+    The fundamental comes from ``fundamental`` (YIN), so a voice whose
+    2nd or 3rd harmonic is louder than its fundamental is not reported an
+    octave high.  It is then sharpened on the spectrum: the strongest of
+    the first ``HARMONICS`` partials is located, refined with a parabola
+    through the log magnitudes of its peak bin and neighbours, and
+    divided by its number; for a Hann window that is within ~0.01 Hz on
+    a 3 s capture.  When YIN finds nothing periodic (a quiet hum under
+    heavy noise) the loudest bin in the band is used instead, stepped
+    down to its lowest clear sub-harmonic.
+    Shorter captures are windowed over their own length and zero-padded
+    to ``FFT_SECONDS``.
+    """
+    if sig.ndim > 1:
+        sig = sig.mean(axis=1)
+    f0  = fundamental(sig, sample_rate)
+    n   = int(FFT_SECONDS*sample_rate)
+    m   = min(len(sig), n)
+    sig = np.pad(sig[:m] * np.hanning(m), (0, n - m))
+
+    spec  = np.fft.rfft(sig)
+    freqs = np.fft.rfftfreq(len(sig), 1/sample_rate)
+    mags  = 20*np.log10(np.abs(spec) + 1e-8)
+
+    band = (freqs >= FREQ_MIN) & (freqs <= FREQ_MAX)
+    if not band.any():
+        return None
+    noise = np.median(mags[band])
+    if f0 is not None:
+        return _harmonic_refine(mags, freqs, f0, noise)
+
+    pk_i   = np.argmax(mags[band])
+    pk_f   = freqs[band][pk_i]
+    pk_db  = mags[band][pk_i]
+
+    if pk_db - noise < PEAK_THRESHOLD_DB:
+        return None
+    pk_f += _peak_offset(mags, np.flatnonzero(band)[pk_i]) * freqs[1]
+    # the loudest partial may be an overtone: take its lowest clear sub-harmonic
+    for k in range(HARMONICS, 1, -1):
+        if pk_f / k < FREQ_MIN:
+            continue
+        lo, hi = np.searchsorted(freqs, (pk_f/k - 2*freqs[1], pk_f/k + 2*freqs[1]))
+        if mags[lo:hi].max() - noise >= SUBHARMONIC_DB:
+            return _harmonic_refine(mags, freqs, pk_f / k, noise)
+    return float(pk_f)
+
+
+def _harmonic_refine(mags_db: np.ndarray, freqs: np.ndarray, f0: float,
+                     floor_db: float) -> float:
+    """*f0* sharpened on the strongest clear partial near k·f0, k ≤ HARMONICS."""
+    best, best_db = f0, floor_db + PEAK_THRESHOLD_DB
+    for k in range(1, HARMONICS + 1):
+        lo, hi = np.searchsorted(freqs, (k*f0*(1 - HARMONIC_TOL), k*f0*(1 + HARMONIC_TOL)))
+        if hi <= lo or hi >= len(freqs):
+            break
+        i = lo + int(np.argmax(mags_db[lo:hi]))
+        if mags_db[i] >= best_db:
+            best, best_db = (freqs[i] + _peak_offset(mags_db, i) * freqs[1]) / k, mags_db[i]
+    return float(best)
+
+
+# ───── Fundamental (YIN) ────────────────────────────────────────────────────
+def _yin_lags(sample_rate: int) -> tuple[int, int, int]:
+    """(shortest lag, longest lag, integration window) in samples."""
+    return (int(sample_rate / FREQ_MAX), int(np.ceil(sample_rate / FREQ_MIN)),
+            int(YIN_WINDOW_S * sample_rate))
+
+
+def yin_frames(sig: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Overlapping frames of *sig*, one row per YIN estimate (a view)."""
+    _, hi, w = _yin_lags(sample_rate)
+    if len(sig) < w + hi:
+        return np.zeros((0, w + hi), dtype=np.float32)
+    return np.lib.stride_tricks.sliding_window_view(sig, w + hi)[::int(YIN_HOP_S * sample_rate)]
+
+
+def yin(frames: np.ndarray, sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    """YIN pitch of every row of *frames* → (f0 Hz, aperiodicity), batched.
+
+    The difference function d(τ) = e(0) + e(τ) − 2·r(τ) is built for a
+    block of ``YIN_BLOCK`` frames at a time: the cross term r from one
+    FFT correlation per frame, the energies e from a running sum of
+    squares.  After cumulative-mean normalisation the lowest point of the
+    first dip under ``YIN_THRESHOLD`` (else the global minimum) is the
+    period, refined by a parabola.  Aperiodicity is the depth of that
+    dip: near 0 for a clean hum, near 1 for noise or silence.
+    """
+    f0, ap = np.zeros(len(frames)), np.ones(len(frames))
+    for s in range(0, len(frames), YIN_BLOCK):
+        f0[s:s + YIN_BLOCK], ap[s:s + YIN_BLOCK] = _yin_block(
+            frames[s:s + YIN_BLOCK], sample_rate)
+    return f0, ap
+
+
+def _yin_block(frames: np.ndarray, sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    lo, hi, w = _yin_lags(sample_rate)
+    x    = np.asarray(frames, dtype=np.float32)
+    nfft = 1 << (x.shape[1] - 1).bit_length()
+    r    = np.fft.irfft(np.fft.rfft(x, nfft) * np.fft.rfft(x[:, :w], nfft).conj(),
+                        nfft)[:, :hi + 1]
+    cs   = np.zeros((len(x), x.shape[1] + 1))
+    np.cumsum(np.square(x, dtype=np.float64), axis=1, out=cs[:, 1:])
+    e    = cs[:, w:w + hi + 1] - cs[:, :hi + 1]              # energy of x[τ:τ+w]
+    d    = np.maximum(e[:, :1] + e - 2*r, 0.0)
+    dn   = np.ones_like(d)
+    dn[:, 1:] = d[:, 1:] * np.arange(1, hi + 1) / np.maximum(np.cumsum(d[:, 1:], axis=1), 1e-12)
+
+    seg    = dn[:, lo:hi]
+    below  = seg < YIN_THRESHOLD
+    after  = np.arange(seg.shape[1]) >= np.argmax(below, axis=1)[:, None]
+    # the whole first dip under the threshold; its deepest lag is the period
+    dip    = after & (np.cumsum(after & ~below, axis=1) == 0)
+    tau    = lo + np.where(below.any(axis=1), np.argmin(np.where(dip, seg, np.inf), axis=1),
+                           np.argmin(seg, axis=1))
+    rows   = np.arange(len(x))
+    a, b, c = dn[rows, tau - 1], dn[rows, tau], dn[rows, tau + 1]
+    den    = a - 2*b + c
+    off    = np.where(den > 0, np.clip(0.5 * (a - c) / np.where(den > 0, den, 1), -0.5, 0.5), 0)
+    ap     = np.where(e[:, 0] > 1e-10 * w, b, 1.0)              # silence is aperiodic
+    return sample_rate / (tau + off), ap
+
+
+def fundamental(sig: np.ndarray, sample_rate: int) -> float | None:
+    """Median YIN f0 over the voiced frames of *sig*, or None if too few."""
+    f0, ap = yin(yin_frames(sig, sample_rate), sample_rate)
+    voiced = f0[ap < YIN_VOICED]
+    if not len(voiced) or len(voiced) < YIN_MIN_VOICED * len(f0):
+        return None
+    return float(np.median(voiced))
+
+
+def _peak_offset(mags_db: np.ndarray, k: int) -> float:
+    """Fractional-bin position of the true peak near bin *k* (−0.5 … 0.5)."""
+    if not 0 < k < len(mags_db) - 1:
+        return 0.0
+    a, b, c = mags_db[k - 1:k + 2]
+    den = a - 2*b + c
+    return 0.0 if den >= 0 else float(np.clip(0.5 * (a - c) / den, -0.5, 0.5))
+
+
+# ───── Whole-file analysis ──────────────────────────────────────────────────
+class _Welch:
+    """Running Welch average of Hann-windowed ``n``-sample segments.
+
+    Memory is one segment plus one spectrum however much audio is pushed.
+    Alongside the average it counts, per band bin, the segments in which
+    that bin (±1) was itself a peak, which is how ``peaks`` tells a steady
+    hum from a one-off burst, and keeps a histogram of the YIN f0 of the
+    new audio in each segment, which is how it tells a fundamental from
+    its overtones.
+    """
+
+    def __init__(self, n: int, hop: int, sample_rate: int) -> None:
+        self.n, self.hop = n, hop
+        self.buf   = np.zeros(n, dtype=np.float32)
+        self.fill  = 0
+        self.win   = np.hanning(n).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(n, 1/sample_rate)
+        self.band  = np.flatnonzero((self.freqs >= FREQ_MIN) & (self.freqs <= FREQ_MAX))
+        self.power = np.zeros(len(self.freqs))
+        self.hits  = np.zeros(len(self.band), dtype=np.int64)
+        self.segments = 0
+        self.sample_rate = sample_rate
+        self.f0_hist = np.zeros(int(1200*np.log2(FREQ_MAX/FREQ_MIN) / F0_CENTS) + 1)
+        self.frames  = 0
+
+    def push(self, x: np.ndarray) -> None:
+        while len(x):
+            k = min(self.n - self.fill, len(x))
+            self.buf[self.fill:self.fill + k] = x[:k]
+            self.fill += k; x = x[k:]
+            if self.fill == self.n:
+                self._pitch(self.buf[self.n - self.hop if self.segments else 0:])
+                self._segment(self.buf * self.win)
+                keep = self.n - self.hop
+                self.buf[:keep] = self.buf[self.hop:]; self.fill = keep
+
+    def _segment(self, seg: np.ndarray) -> None:
+        spec = np.abs(np.fft.rfft(seg, self.n)) ** 2
+        self.power += spec
+        self.segments += 1
+        db  = 10*np.log10(spec[self.band] + 1e-16)
+        pk  = np.zeros(len(db), dtype=bool)
+        pk[_local_peaks(db, np.median(db) + PEAK_THRESHOLD_DB)] = True
+        pk[1:] |= pk[:-1].copy(); pk[:-1] |= pk[1:].copy()
+        self.hits += pk
+
+    def _pitch(self, new: np.ndarray) -> None:
+        f0, ap = yin(yin_frames(new, self.sample_rate), self.sample_rate)
+        self.frames += len(f0)
+        f0 = f0[(ap < YIN_VOICED) & (f0 >= FREQ_MIN) & (f0 <= FREQ_MAX)]
+        idx = np.rint(1200*np.log2(f0 / FREQ_MIN) / F0_CENTS).astype(int)
+        self.f0_hist += np.bincount(idx, minlength=len(self.f0_hist))[:len(self.f0_hist)]
+
+    def fundamental(self) -> float | None:
+        """Centre of the densest half-semitone of the f0 histogram."""
+        voiced = self.f0_hist.sum()
+        if not voiced or voiced < YIN_MIN_VOICED * self.frames:
+            return None
+        span = 50 // F0_CENTS
+        c = int(np.argmax(np.convolve(self.f0_hist, np.ones(2*span + 1), "same")))
+        lo, hi = max(0, c - span), c + span + 1
+        cents = np.average(np.arange(lo, hi)[:len(self.f0_hist[lo:hi])] * F0_CENTS,
+                           weights=self.f0_hist[lo:hi])
+        return float(FREQ_MIN * 2 ** (cents / 1200))
+
+    def peaks(self, top: int) -> list[dict]:
+        if not self.segments and self.fill:       # shorter than one segment
+            m = self.fill
+            self._pitch(self.buf[:m])
+            self._segment(self.buf[:m] * np.hanning(m))
+        if not self.segments or not len(self.band):
+            return []
+        db    = 10*np.log10(self.power / self.segments + 1e-16)
+        band  = db[self.band]
+        floor = np.median(band)
+        found = []
+        for i in _local_peaks(band, floor + PEAK_THRESHOLD_DB):
+            stability = self.hits[i] / self.segments
+            if stability >= PEAK_STABILITY:
+                k = self.band[i]
+                found.append({"hz": float(self.freqs[k] + _peak_offset(db, k) * self.freqs[1]),
+                              "db": float(band[i] - floor),
+                              "stability": float(stability), "harmonic": None})
+        f0 = self.fundamental()
+        if f0 is not None:
+            for p in sorted(found, key=lambda p: -p["db"]):   # loudest per partial
+                k = round(p["hz"] / f0)
+                if (k >= 1 and abs(p["hz"] / (k * f0) - 1) <= HARMONIC_TOL
+                        and all(q["harmonic"] != k for q in found)):
+                    p["harmonic"] = k
+            partials = [p for p in found if p["harmonic"]]
+            if partials and not any(p["harmonic"] == 1 for p in partials):
+                # fundamental too weak to rank: place it from its loudest partial
+                p  = max(partials, key=lambda p: p["db"])
+                hz = p["hz"] / p["harmonic"]
+                k  = min(int(np.searchsorted(self.freqs, hz)), len(db) - 1)
+                found.append({"hz": hz, "db": float(db[k] - floor),
+                              "stability": float(self.f0_hist.sum() / self.frames),
+                              "harmonic": 1})
+        found.sort(key=lambda p: (p["harmonic"] != 1, -p["db"]))
+        return found[:top]
+
+
+def _local_peaks(db: np.ndarray, level: float) -> np.ndarray:
+    """Indices of interior local maxima of *db* at or above *level*."""
+    mid = db[1:-1]
+    return np.flatnonzero((mid > db[:-2]) & (mid >= db[2:]) & (mid >= level)) + 1
+
+
+def analyse_file(path: str, top: int = 5, blocksize: int = 1 << 16) -> list[dict]:
+    """Ranked stable hum peaks across the whole of *path*, strongest first.
+
+    The file is decoded block by block at its own rate (no resampling) and
+    cut into ``FFT_SECONDS`` segments overlapping by ``WELCH_OVERLAP``,
+    whose power spectra are averaged, so memory stays constant however
+    long the recording.  Each peak is ``{"hz", "db", "stability",
+    "harmonic"}``: the refined frequency, its height above the band's
+    median level, the share of segments it was a peak in, and which
+    partial of the file's YIN fundamental it is (None if unrelated).
+    Peaks must clear ``PEAK_THRESHOLD_DB`` and recur in ``PEAK_STABILITY``
+    of segments.  The fundamental is listed first, then the rest by
+    level.  A trailing part shorter than one hop is not analysed.
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(path) as f:
+        n = int(FFT_SECONDS * f.samplerate)
+        welch = _Welch(n, n - int(n * WELCH_OVERLAP), f.samplerate)
+        for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+            welch.push(block.mean(axis=1))
+    return welch.peaks(top)
+
+
+# ───── Live tracking ────────────────────────────────────────────────────────
+class PitchTracker:
+    """Continuous hum estimates from audio pushed by an input callback.
+
+    ``push`` (audio thread) copies each block into a ring buffer holding
+    the last *capacity_s* seconds and wakes a worker thread once a hop of
+    new audio has arrived.  The worker analyses the newest *window_s*
+    seconds, so windows overlap by ``window_s - hop_s``, and publishes a
+    ``result`` dict the UI can poll:
+
+        hz         median of the recent estimates (None until one is found)
+        latest     this hop's estimate or None
+        stability  0–1, share of the last *history* hops within STABLE_CENTS
+        latency_ms hop completed → result published
+        cpu_ms     worker CPU time spent on this hop
+    """
+
+    def __init__(self, sample_rate: int, window_s: float = LIVE_WINDOW_S,
+                 hop_s: float = LIVE_HOP_S, capacity_s: float = FFT_SECONDS,
+                 history: int = 8) -> None:
+        self.sample_rate = sample_rate
+        self.window = int(window_s * sample_rate)
+        self.hop    = int(hop_s * sample_rate)
+        self.ring   = np.zeros(max(self.window, int(capacity_s * sample_rate)),
+                               dtype=np.float32)
+        self.history = deque(maxlen=history)
+        self.timings = deque(maxlen=50)           # (latency_ms, cpu_ms) per hop
+        self.result  = None
+        self._written = 0                         # samples pushed in total
+        self._pending = 0                         # samples since the last hop
+        self._hop_at  = 0.0
+        self._wake    = threading.Event()
+        self._running = False
+        self._thread  = None
+
+    # Audio thread --------------------------------------------------------------
+    def push(self, block: np.ndarray) -> None:
+        n, size = len(block), len(self.ring)
+        if n >= size:
+            block, n = block[-size:], size
+        w = self._written % size
+        k = min(n, size - w)
+        self.ring[w:w + k] = block[:k]
+        self.ring[:n - k] = block[k:]
+        self._written += n
+        self._pending += n
+        if self._pending >= self.hop:
+            self._pending = 0
+            self._hop_at = time.perf_counter()
+            self._wake.set()
+
+    # Worker --------------------------------------------------------------------
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def recent(self, seconds: float) -> np.ndarray:
+        """Copy of the newest *seconds* of audio (less if not yet recorded)."""
+        size = len(self.ring)
+        n = min(int(seconds * self.sample_rate), self._written, size)
+        w = self._written % size
+        return np.roll(self.ring, -w)[size - n:]
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                return
+            hop_at, cpu0 = self._hop_at, time.thread_time()
+            if self._written < self.window:
+                continue
+            latest = analyse_hum(self.recent(self.window / self.sample_rate),
+                                 self.sample_rate)
+            self.history.append(latest)
+            found = [f for f in self.history if f is not None]
+            hz = float(np.median(found)) if found else None
+            agree = sum(abs(1200 * np.log2(f / hz)) <= STABLE_CENTS
+                        for f in found) if hz else 0
+            timing = ((time.perf_counter() - hop_at) * 1000,
+                      (time.thread_time() - cpu0) * 1000)
+            self.timings.append(timing)
+            self.result = {"hz": hz, "latest": latest,
+                           "stability": float(agree) / self.history.maxlen,
+                           "latency_ms": timing[0], "cpu_ms": timing[1]}
+
+    def timing_summary(self) -> dict:
+        """Mean / max latency and CPU per hop over the last 50 hops."""
+        if not self.timings:
+            return {}
+        lat, cpu = np.array(self.timings).T
+        return {"hops": len(lat), "latency_ms": float(lat.mean()),
+                "latency_max_ms": float(lat.max()), "cpu_ms": float(cpu.mean()),
+                "hop_ms": self.hop / self.sample_rate * 1000}
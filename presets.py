@@ -0,0 +1,531 @@
+"""
+presets.py
+──────────
+Built-in binaural presets and the preset storage shared by the Binaural
+Beat Lab and the command-line tools.  Kept free of Tk so servers can
+import it.
+
+The library lives in a SQLite database: every save or delete is its own
+atomic transaction touching one row, so a crash can no longer truncate
+the whole library and cost no longer grows with its size.  On first run
+the legacy ``binaural_presets.json`` is migrated into it once.
+
+Saved resonator tones go to an append-only, line-delimited log
+(``user_resonance.jsonl``, see ``ResonanceLog``) that readers follow from
+their last offset; the legacy ``user_resonance.json`` list is migrated
+into it once.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+PRESETS_DB    = "binaural_presets.db"
+PRESETS_FILE  = "binaural_presets.json"    # legacy library, migrated once
+# Log appended by ⭐ Mark Tone in consciousness_resonator.py
+USER_RES_FILE = "user_resonance.jsonl"
+LEGACY_RES_FILE = "user_resonance.json"    # pre-log list of tones, migrated once
+COMPACT_MIN_DEAD = 100                     # superseded lines before a compaction
+
+# ───── Built-in library ─────────────────────────────────────────────────────
+DEFAULT_PRESETS = {
+    # Δ Delta ‑ 0.5‑4 Hz
+    "Delta Sleep":        {"carrier": 120.0, "beat": 3.5, "desc": "Delta rhythm for restful, deep sleep."},
+    "Delta Healing":      {"carrier": 100.0, "beat": 2.5, "desc": "Deep delta for physical healing."},
+    "Delta Renewal":      {"carrier": 100.0, "beat": 1.0, "desc": "Ultra‑low delta for cellular repair."},
+    "Deep Sleep":         {"carrier": 100.0, "beat": 1.5, "desc": "Sub‑delta drift for hypnosis & deep sleep."},
+    "Float State":        {"carrier":  80.0, "beat": 0.5, "desc": "Delta flotation state for introspection."},
+    "Astral Hum":         {"carrier":  30.0, "beat": 0.7, "desc": "Sub‑delta hum to ease into astral travel."},
+    "Focus 3":            {"carrier": 200.0, "beat": 3.0, "desc": "Monroe Focus 3 pre‑hypnagogic state."},
+
+    # Θ Theta ‑ 4‑8 Hz
+    "Theta Relax":        {"carrier": 200.0, "beat": 6.0, "desc": "Gentle theta for relaxation."},
+    "Theta Meditation":   {"carrier": 250.0, "beat": 5.0, "desc": "Theta rhythm for deep meditation."},
+    "Theta Insight":      {"carrier": 220.0, "beat": 7.0, "desc": "Theta for creative insights."},
+    "Gateway Voyage":     {"carrier": 100.0, "beat": 4.0, "desc": "Access deeper mind states, OBEs."},
+    "Lucid Entry":        {"carrier": 140.0, "beat": 6.0, "desc": "High‑theta for lucid dreaming."},
+    "Deep Theta OBE":     {"carrier": 180.0, "beat": 5.5, "desc": "Theta tuned for OBE induction."},
+    "Astra Journey":      {"carrier": 210.0, "beat": 7.5, "desc": "Theta blend for astral exploration."},
+    "OBE Induction":      {"carrier": 130.0, "beat": 4.5, "desc": "Hemi‑Sync OBE pattern."},
+    "Patterning":         {"carrier": 110.0, "beat": 7.0, "desc": "Hemi‑Sync patterning for visualization."},
+    "Stargate Schumann":  {"carrier": 100.0, "beat": 7.83,"desc": "Schumann resonance for clarity."},
+    "Stargate Protocol I":{"carrier":  90.0, "beat": 6.5,"desc": "Project Stargate pattern I."},
+
+    # Α Alpha ‑ 8‑13 Hz
+    "Alpha Relax":        {"carrier": 300.0, "beat":10.0,"desc": "Alpha for calm and stress relief."},
+    "Alpha Creativity":   {"carrier": 270.0, "beat": 8.0,"desc": "Alpha to boost creativity."},
+    "Alpha Focus":        {"carrier": 260.0, "beat":12.0,"desc": "Upper‑alpha focus."},
+    "Alpha Memory":       {"carrier": 240.0, "beat": 9.0,"desc": "Alpha to enhance memory."},
+    "Mind Mirror":        {"carrier": 150.0, "beat": 8.0,"desc": "Alpha/SMR blend for clarity."},
+    "Light Journey":      {"carrier": 200.0, "beat":10.0,"desc": "Alpha exploration."},
+    "Focus 10":           {"carrier": 100.0, "beat":10.0,"desc": "Mind awake, body asleep."},
+    "Focus 12":           {"carrier": 100.0, "beat":12.0,"desc": "Expanded awareness."},
+    "Focus 13":           {"carrier": 110.0, "beat":13.0,"desc": "Coherence bridge between Focus 12 & 15."},
+    "Stargate Protocol II":{"carrier": 90.0, "beat": 9.5,"desc": "Project Stargate pattern II."},
+
+    # Β Beta ‑ 13‑30 Hz   (Monroe higher foci map ≈ beat‑freq index)
+    "Beta Focus":         {"carrier": 210.0, "beat":14.0,"desc": "Low‑beta focused attention."},
+    "Focus 15":           {"carrier": 200.0, "beat":15.0,"desc": "Focus 15: no‑time state."},
+    "Beta Cognition":     {"carrier": 200.0, "beat":16.0,"desc": "Mid‑beta analytical thinking."},
+    "Focus 18":           {"carrier": 120.0, "beat":18.0,"desc": "Heart‑centered emotional healing zone."},
+    "Beta Alertness":     {"carrier": 160.0, "beat":18.0,"desc": "High‑beta alertness."},
+    "Beta Energy":        {"carrier": 150.0, "beat":20.0,"desc": "High‑beta motivation."},
+    "Focus 21":           {"carrier": 150.0, "beat":21.0,"desc": "Focus 21: bridge to the astral."},
+    "Focus 22":           {"carrier": 140.0, "beat":22.0,"desc": "Territory of confused, dream‑bound minds."},
+    "Beta Performance":   {"carrier": 180.0, "beat":22.0,"desc": "Peak‑beta performance."},
+    "Focus 23":           {"carrier": 135.0, "beat":23.0,"desc": "Recently deceased attached to Earth life."},
+    "Focus 24":           {"carrier": 130.0, "beat":24.0,"desc": "Collective belief‑system regions."},
+    "Brain Spark":        {"carrier": 200.0, "beat":25.0,"desc": "High‑beta spark for alertness."},
+    "Focus 25":           {"carrier": 125.0, "beat":25.0,"desc": "Power/guru belief territories."},
+    "Focus 26":           {"carrier": 120.0, "beat":26.0,"desc": "Transition zone beyond rigid belief."},
+    "Focus 27":           {"carrier": 150.0, "beat":27.0,"desc": "Focus 27: reception & planning center."},
+
+    # Γ Gamma ‑ 30‑50 Hz
+    "Gamma Integration":  {"carrier": 400.0, "beat":30.0,"desc": "Gamma for information integration."},
+    "Focus 34":           {"carrier": 180.0, "beat":34.0,"desc": "NPC junction – collective cluster."},
+    "Gamma Learning":     {"carrier": 360.0, "beat":35.0,"desc": "Gamma for accelerated learning."},
+    "Focus 35":           {"carrier": 175.0, "beat":35.0,"desc": "Inter‑civilisation gathering point."},
+    "Gamma Cognition":    {"carrier": 420.0, "beat":40.0,"desc": "High‑gamma cognition."},
+    "Focus 42":           {"carrier": 200.0, "beat":42.0,"desc": "Cosmic consciousness plateau."},
+    "Gamma Consciousness":{"carrier": 300.0, "beat":45.0,"desc": "Gamma for expanded awareness."},
+    "Focus 49":           {"carrier": 210.0, "beat":49.0,"desc": "Edge of mapped human territory."}
+}
+
+# Brainwave bands by beat frequency: (tree label, lower edge Hz).  A preset
+# belongs to the last band whose edge is ≤ its beat; 0 Hz means no beat.
+BANDS = (
+    ("Delta Waves (0.5–4 Hz)",  0.0),
+    ("Theta Waves (4–8 Hz)",    4.0),
+    ("Alpha Waves (8–12 Hz)",   8.0),
+    ("Beta Waves (13–30 Hz)",  13.0),
+    ("Gamma Waves (30–50 Hz)", 30.0),
+)
+
+
+def band_of(beat: float) -> str | None:
+    """Tree label of the band containing *beat*, or None for a pure tone."""
+    if beat <= 0:
+        return None
+    label = BANDS[0][0]
+    for name, lo in BANDS:
+        if beat >= lo:
+            label = name
+    return label
+
+
+CATEGORIES = {label: [n for n, p in DEFAULT_PRESETS.items()
+                      if band_of(p["beat"]) == label]
+              for label, _ in BANDS}
+
+
+# ───── Storage ──────────────────────────────────────────────────────────────
+class PresetStore:
+    """SQLite-backed preset library with per-record atomic updates.
+
+    Presets keep their insertion order (SQLite rowid); re-saving an
+    existing name updates it in place.
+    """
+
+    def __init__(self, path: str = PRESETS_DB,
+                 legacy_json: str = PRESETS_FILE) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS presets ("
+                " name TEXT PRIMARY KEY, carrier REAL NOT NULL,"
+                " beat REAL NOT NULL, desc TEXT NOT NULL DEFAULT '')")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if self._db.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is None:
+            self._seed(legacy_json)
+
+    def _seed(self, legacy_json: str) -> None:
+        """One-time import of the legacy JSON library (or the built-ins)."""
+        source, data = "defaults", DEFAULT_PRESETS
+        if legacy_json and os.path.exists(legacy_json):
+            try:
+                with open(legacy_json, "r") as f:
+                    data = json.load(f)
+                source = legacy_json
+            except Exception:
+                pass  # corrupt legacy file → fall back to built-ins
+        rows = [(name, float(p["carrier"]), float(p["beat"]), p.get("desc", ""))
+                for name, p in data.items()
+                # old saves persisted these; they are rebuilt from USER_RES_FILE
+                if not name.startswith("Personal Resonance #")]
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO presets VALUES (?, ?, ?, ?)", rows)
+            self._db.execute("INSERT INTO meta VALUES ('seeded', ?)", (source,))
+
+    def all(self) -> dict:
+        cur = self._db.execute(
+            "SELECT name, carrier, beat, desc FROM presets ORDER BY rowid")
+        return {name: {"carrier": c, "beat": b, "desc": d}
+                for name, c, b, d in cur}
+
+    def put(self, name: str, preset: dict) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT INTO presets VALUES (?, ?, ?, ?) ON CONFLICT(name) DO UPDATE"
+                " SET carrier = excluded.carrier, beat = excluded.beat,"
+                " desc = excluded.desc",
+                (name, float(preset["carrier"]), float(preset["beat"]),
+                 preset.get("desc", "")))
+
+    def delete(self, name: str) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM presets WHERE name = ?", (name,))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# ───── Search ───────────────────────────────────────────────────────────────
+_NUM   = r"(\d+(?:\.\d+)?)"
+_FIELD = re.compile(
+    rf"\b(carrier|beat)\s*(?:(<=|>=|<|>|=)\s*{_NUM}|{_NUM}\s*(?:-|–|to)\s*{_NUM}"
+    rf"|{_NUM})(?:\s*hz\b)?")
+_BAND_WORDS = {label.split()[0].lower(): (lo, BANDS[k+1][1] if k+1 < len(BANDS)
+                                          else np.inf)
+               for k, (label, lo) in enumerate(BANDS)}
+
+
+def parse_query(query: str):
+    """Split a search string into a text phrase and numeric conditions.
+
+    ``"theta lucid"``, ``"beat 6–8 Hz, carrier < 150"``, ``"focus beat>=20"``
+    → ``("lucid", [("beat", ">=", 4.0), …])``.  Band names become beat
+    ranges; whatever text remains is matched as one substring.
+    """
+    q, conds = query.lower(), []
+
+    def field(m):
+        name, op, val, lo, hi, eq = m.groups()
+        if op:
+            conds.append((name, op, float(val)))
+        elif lo:
+            conds.extend([(name, ">=", float(lo)), (name, "<=", float(hi))])
+        else:
+            conds.append((name, "=", float(eq)))
+        return " "
+
+    q = _FIELD.sub(field, q)
+    words = []
+    for w in re.split(r"[\s,;]+", q):
+        if w in _BAND_WORDS:
+            lo, hi = _BAND_WORDS[w]
+            conds += [("beat", ">", 0.0), ("beat", ">=", lo), ("beat", "<", hi)]
+        elif w and w != "hz":
+            words.append(w)
+    return " ".join(words), conds
+
+
+class PresetIndex:
+    """Vectorised search over names, descriptions, carrier and beat.
+
+    Text lives in one byte-string array so substring tests run in NumPy
+    rather than a Python loop, and numeric conditions are array masks.
+    Typing more characters narrows the previous hit list instead of
+    rescanning the library.
+    """
+
+    _OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater,
+            ">=": np.greater_equal, "=": np.isclose}
+
+    def __init__(self, library: dict) -> None:
+        self.names   = list(library)
+        self._text   = np.array([f"{n}\n{p.get('desc', '')}".lower().encode()
+                                 for n, p in library.items()] or [b""])
+        self._lname  = np.array([n.lower().encode() for n in self.names] or [b""])
+        self.carrier = np.array([float(p["carrier"]) for p in library.values()])
+        self.beat    = np.array([float(p["beat"]) for p in library.values()])
+        self._last   = ("", np.arange(len(self.names)))   # (phrase, hits)
+
+    def _text_hits(self, phrase: str) -> np.ndarray:
+        last_phrase, last_hits = self._last
+        ids = last_hits if last_phrase in phrase else np.arange(len(self.names))
+        if phrase:
+            ids = ids[np.char.find(self._text[ids], phrase.encode()) >= 0]
+        self._last = (phrase, ids)
+        return ids
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        """Names matching *query*, name-prefix matches first."""
+        phrase, conds = parse_query(query)
+        ids = self._text_hits(phrase)
+        if conds:
+            keep = np.ones(len(ids), dtype=bool)
+            for name, op, val in conds:
+                keep &= self._OPS[op](getattr(self, name)[ids], val)
+            ids = ids[keep]
+        if phrase:
+            prefix = np.char.startswith(self._lname[ids], phrase.encode())
+            ids = ids[np.argsort(~prefix, kind="stable")]
+        return [self.names[i] for i in ids[:limit]]
+
+
+# ───── Resonance log ────────────────────────────────────────────────────────
+@contextmanager
+def _locked(path: str, timeout: float = 5.0, stale: float = 30.0):
+    """Hold ``path + '.lock'`` (created exclusively) for a short write."""
+    lock, t0 = path + ".lock", time.monotonic()
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > stale:
+                    os.remove(lock)                     # left by a crashed writer
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() - t0 > timeout:
+                raise TimeoutError(f"{lock} is held by another writer")
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock)
+
+
+def _legacy_records(text: bytes) -> list[dict] | None:
+    """Records of a pre-log JSON file (list or single object), else None.
+
+    The whole file must parse as one JSON value; a single object followed
+    by its newline and nothing else is a one-line log, not a legacy file.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None                                 # a log, or a corrupt file
+    if isinstance(data, dict):
+        if text.count(b"\n") == 1 and text.endswith(b"\n"):
+            return None
+        data = [data]
+    if not isinstance(data, list):
+        return None
+    return [rec for rec in data if isinstance(rec, dict)]
+
+
+def _is_json(text: bytes) -> bool:
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _fold(records: list[dict]) -> list[dict]:
+    """Drop records superseded by a later one with the same ``source``."""
+    last = {rec["source"]: i for i, rec in enumerate(records) if rec.get("source")}
+    return [rec for i, rec in enumerate(records)
+            if not rec.get("source") or last[rec["source"]] == i]
+
+
+class ResonanceLog:
+    """Saved resonator tones as one JSON object per line, oldest first.
+
+    ``append`` adds whole lines with a single ``O_APPEND`` write under a
+    lock file, so two running apps never overwrite each other's tones.
+    ``records`` reads only the bytes appended since its last call (a line
+    still being written waits for the next one).  A record with a
+    ``source`` supersedes earlier ones from the same source; once more
+    than ``COMPACT_MIN_DEAD`` (and more than half the) lines are dead the
+    log is rewritten without them and swapped in atomically.
+
+    ``generation`` changes whenever records already returned may have
+    moved (another process compacted, or a source was replaced), telling
+    followers to rebuild instead of extending.  A legacy list / single-
+    object JSON file, at *path* or at *legacy*, is read as-is and turned
+    into a log on the first write.
+    """
+
+    def __init__(self, path: str = USER_RES_FILE, legacy: str | None = None) -> None:
+        self.path   = path
+        self.legacy = legacy if legacy is not None else (
+            LEGACY_RES_FILE if path == USER_RES_FILE else None)
+        self.generation = 0
+        self._records: list[dict] = []
+        self._cursor = None                         # (inode, byte offset) read so far
+        self._lines  = 0                            # lines behind self._records
+        self._log_ino = None                        # inode known to be a log already
+
+    def read(self, cursor: tuple | None = None) -> tuple[list[dict], tuple | None, bool]:
+        """Records after *cursor* → (records, new cursor, reset).
+
+        *reset* is True when the file was replaced or truncated since
+        *cursor*, in which case everything was read from the start.
+        """
+        path = self.path
+        if not os.path.exists(path) and self.legacy and os.path.exists(self.legacy):
+            path = self.legacy
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return [], None, cursor is not None
+        ident, offset = cursor or (None, 0)
+        reset = cursor is not None and (ident != (path, st.st_ino) or st.st_size < offset)
+        if reset:
+            offset = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        if offset == 0:
+            legacy = _legacy_records(data)
+            if legacy is not None:
+                return legacy, ((path, st.st_ino), len(data)), reset
+            if path == self.legacy:                 # corrupt legacy file: never a log
+                return [], ((path, st.st_ino), len(data)), reset
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue                            # torn line from a crash
+            if isinstance(rec, dict):
+                records.append(rec)
+        return records, ((path, st.st_ino), offset + end), reset
+
+    def records(self) -> list[dict]:
+        """Every live record, reading only what was appended since last time."""
+        new, self._cursor, reset = self.read(self._cursor)
+        if reset:
+            self._records, self._lines = [], 0
+            self.generation += 1
+        self._lines += len(new)
+        if any(rec.get("source") for rec in new):
+            before = len(self._records)
+            self._records = _fold(self._records + new)
+            if len(self._records) != before + len(new):
+                self.generation += 1
+        else:
+            self._records.extend(new)
+        dead = self._lines - len(self._records)
+        if dead > max(COMPACT_MIN_DEAD, len(self._records)):
+            try:
+                self.compact()
+            except OSError:
+                pass                                # another writer holds it; next time
+        return self._records
+
+    def append(self, entries: list[dict]) -> None:
+        """Atomically add *entries* at the end of the log."""
+        data = b"".join(json.dumps(e, separators=(",", ":")).encode() + b"\n"
+                        for e in entries)
+        with _locked(self.path):
+            self._migrate()
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data         # never extend a torn line
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT
+                         | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
+
+    def compact(self) -> None:
+        """Rewrite the log without superseded or unreadable lines."""
+        with _locked(self.path):
+            records, _, _ = self.read()
+            self._rewrite(_fold(records))
+        self._records, self._lines = [], 0
+        self._cursor = None
+        self.generation += 1
+        self.records()
+
+    def _migrate(self) -> None:
+        """Turn a legacy JSON file (at path or legacy) into a log. Lock held.
+
+        Only a file that parsed is migrated; an unreadable legacy file is
+        left where it is.
+        """
+        src = self.path if os.path.exists(self.path) else self.legacy
+        if not src or not os.path.exists(src):
+            return
+        with open(src, "rb") as f:
+            if src == self.path:                    # sniff, so a save stays O(1)
+                ino = os.fstat(f.fileno()).st_ino
+                if ino == self._log_ino:
+                    return
+                first = f.readline()
+                if not first or (first[:1] == b"{" and first.endswith(b"\n")
+                                 and _is_json(first)):
+                    self._log_ino = ino             # empty, or a log line first
+                    return
+                f.seek(0)
+            legacy = _legacy_records(f.read())
+        if legacy is not None:
+            self._rewrite(legacy)
+        elif src == self.path:
+            self._log_ino = ino                     # a log with a torn first line
+
+    def _rewrite(self, records: list[dict]) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", newline="\n") as f:
+            for rec in records:
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+# ───── Loading ──────────────────────────────────────────────────────────────
+def resonance_presets(records: list[dict], start: int = 1) -> dict:
+    """``Personal Resonance #n`` presets for *records*, numbered from *start*."""
+    presets = {}
+    for idx, rec in enumerate(records, start=start):
+        try:
+            hz = float(rec.get("hz") or rec.get("personal_resonance", 0))
+        except (TypeError, ValueError):
+            continue
+        if hz > 0:
+            presets[f"Personal Resonance #{idx}"] = {
+                "carrier": hz,
+                "beat": 0.0,
+                "desc": "Saved Consciousness Resonator tone."
+            }
+    return presets
+
+
+def personal_resonances(res_file: str = USER_RES_FILE) -> dict:
+    """``Personal Resonance #n`` presets built from saved resonator tones."""
+    try:
+        return resonance_presets(ResonanceLog(res_file).records())
+    except OSError:
+        return {}                    # unreadable log: no personal presets
+
+
+def save_resonances(entries: list[dict], res_file: str = USER_RES_FILE) -> None:
+    """Append *entries* to the resonance log at *res_file*.
+
+    An entry with a ``source`` supersedes earlier ones from the same
+    source, so re-analysing a recording updates its tone instead of
+    adding another.
+    """
+    ResonanceLog(res_file).append(entries)
+
+
+def load_presets(db: str = PRESETS_DB, res_file: str = USER_RES_FILE) -> dict:
+    """Return the preset library plus ``Personal Resonance #n`` entries."""
+    store = PresetStore(db)
+    try:
+        presets = store.all()
+    finally:
+        store.close()
+    presets.update(personal_resonances(res_file))
+    return presets
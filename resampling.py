@@ -0,0 +1,127 @@
+"""
+resampling.py
+─────────────
+Sample-rate conversion for TTS and recorded affirmation audio.  Hum
+recordings need none: ``hum_analysis.analyse_file`` works at the file's
+own rate.
+
+• Resampler   → streaming polyphase windowed-sinc converter for one rate pair
+• resample()  → convert a whole mono signal (chunked under the hood)
+
+The rate ratio is reduced to up/down and a Kaiser-windowed sinc low-pass
+(β = 8, ≈ −80 dB stop band) is split into ``up`` phases.  Upsampling uses
+``TAPS`` taps per phase with the −6 dB point at ``CUTOFF`` of the source
+Nyquist; images of content above ≈ 0.85 of it are only partly removed.
+Downsampling widens each phase to ``DOWN_TAPS`` taps per *output* sample
+and moves the −6 dB point to ``DOWN_CUTOFF``, so the stop band starts at
+the output Nyquist: everything that would alias is down ≈ 80 dB, and the
+pass band (−0.1 dB) reaches ≈ 0.84 of the output Nyquist (18.5 kHz at
+44.1 kHz).  The phase bank is designed once per (up, down) pair and
+cached, so re-previewing a clip never redesigns the filter.  Each output
+sample is a dot product of one phase with the newest input samples,
+evaluated for a whole block at a time; state carries between ``process``
+calls, so the output is the same however the input is chunked.
+"""
+
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+TAPS     = 32                              # taps per phase when upsampling
+BETA     = 8.0                             # Kaiser window β (stop band ≈ −80 dB)
+CUTOFF   = 0.94                            # −6 dB point, share of the source Nyquist
+DOWN_TAPS   = 64                           # taps per output sample when downsampling
+DOWN_CUTOFF = 0.92                         # −6 dB point, share of the output Nyquist
+CHUNK    = 16_384                          # outputs computed per gather
+
+
+@lru_cache(maxsize=32)
+def _phases(up: int, down: int) -> np.ndarray:
+    """``(up, taps)`` polyphase bank, taps reversed so rows dot straight
+    into the input window (oldest sample first)."""
+    if down > up:                           # keep the transition below the output Nyquist
+        taps, cutoff = -(-DOWN_TAPS * down // up), DOWN_CUTOFF
+    else:
+        taps, cutoff = TAPS, CUTOFF
+    n  = up * taps - 1                      # odd: centred on a whole sample
+    fc = cutoff * 0.5 / max(up, down)       # cycles per upsampled sample
+    t  = np.arange(n) - (n - 1) // 2
+    h  = 2 * fc * np.sinc(2 * fc * t) * np.kaiser(n, BETA)
+    h  = np.append(h * up / h.sum(), 0.0)   # unity DC gain after zero-stuffing
+    bank = h.reshape(taps, up).T            # bank[p, k] = h[p + k·up]
+    bank = bank[:, ::-1].astype(np.float32)
+    bank.flags.writeable = False
+    return bank
+
+
+class Resampler:
+    """Streaming mono rate converter from *src_rate* to *dst_rate*.
+
+    Feed blocks to ``process`` and finish with ``flush``; the concatenated
+    results equal ``resample`` of the whole signal: ``ceil(n·dst/src)``
+    samples, delay-compensated so the output lines up with the input.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int) -> None:
+        g = gcd(int(src_rate), int(dst_rate))
+        self.up, self.down = int(dst_rate) // g, int(src_rate) // g
+        self.bank = _phases(self.up, self.down)
+        self.taps = self.bank.shape[1]
+        # centre of the filter, in upsampled samples
+        self._centre = (self.up * self.taps - 2) // 2
+        self.reset()
+
+    def reset(self) -> None:
+        self._buf  = np.zeros(self.taps - 1, dtype=np.float32)   # history
+        self._base = -(self.taps - 1)       # input index of _buf[0]
+        self._out  = 0                      # outputs produced so far
+        self._seen = 0                      # inputs received so far
+
+    def _ready(self, available: int) -> int:
+        """Outputs whose newest input index is below *available*."""
+        # output m reads inputs up to q = (m·down + centre) // up
+        last = available * self.up - 1 - self._centre
+        return max(0, last // self.down + 1 - self._out) if last >= 0 else 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32)
+        self._seen += len(block)
+        return self._run(block, self._ready(self._seen))
+
+    def flush(self) -> np.ndarray:
+        """Emit the outputs still waiting on future input (zero tail)."""
+        total = -(-self._seen * self.up // self.down)
+        need  = total - self._out
+        if need <= 0:
+            return np.zeros(0, dtype=np.float32)
+        return self._run(np.zeros(self.taps, dtype=np.float32), need)
+
+    def _run(self, block: np.ndarray, count: int) -> np.ndarray:
+        taps = self.taps
+        buf = np.concatenate((self._buf, block))
+        out = np.empty(count, dtype=np.float32)
+        win = np.lib.stride_tricks.sliding_window_view(buf, taps)
+        for s in range(0, count, CHUNK):
+            m = np.arange(self._out + s, self._out + min(s + CHUNK, count))
+            n = m * self.down + self._centre
+            q, p = n // self.up, n % self.up
+            np.einsum("ij,ij->i", win[q - (taps - 1) - self._base], self.bank[p],
+                      out=out[s:s + len(m)])
+        self._out += count
+        # keep only what future outputs can still reach
+        nxt  = (self._out * self.down + self._centre) // self.up - (taps - 1)
+        keep = max(0, nxt - self._base)
+        self._buf, self._base = buf[keep:], self._base + keep
+        return out
+
+
+def resample(sig: np.ndarray, src_rate: int, dst_rate: int,
+             chunk: int = 1 << 16) -> np.ndarray:
+    """Resample a mono signal from *src_rate* to *dst_rate* (float32)."""
+    if src_rate == dst_rate:
+        return sig
+    r = Resampler(src_rate, dst_rate)
+    parts = [r.process(sig[i:i + chunk]) for i in range(0, len(sig), chunk)]
+    parts.append(r.flush())
+    return np.concatenate(parts)
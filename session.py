@@ -0,0 +1,194 @@
+"""
+session.py
+──────────
+Session timelines for unattended programs, e.g. Alpha Relax → Theta
+Meditation → Delta Sleep with multi-minute glides.
+
+A session file is JSON:
+
+    {"segments": [
+        {"preset": "Alpha Relax", "hold": 600},
+        {"preset": "Theta Meditation", "ramp": 300, "curve": "cosine", "hold": 1200},
+        {"carrier": 120, "beat": 3.5, "volume": 0.4, "ramp": 600, "hold": 2700}
+    ]}
+
+Each segment glides from the previous segment's carrier / beat / volume to
+its own over ``ramp`` seconds, then holds for ``hold`` seconds.  A segment
+may name a preset instead of giving carrier/beat; ``volume`` defaults to
+the previous value (0.5 at the start).  Curves: linear, cosine (eased) or
+exp (constant ratio per second, good for frequency sweeps).
+
+The phase of every sample is evaluated in closed form from its absolute
+frame index, so the live callback and the offline export produce the same
+samples whatever their block sizes, with no phase drift over long programs.
+"""
+
+import bisect
+import json
+import math
+
+import numpy as np
+
+CURVES = ("linear", "cosine", "exp")
+DEFAULT_VOLUME = 0.5
+
+
+# ───── Glide maths (in place, float64) ──────────────────────────────────────
+def _cycles(out, u, seconds, a0, a1, curve, tmp):
+    """out ← cycles run by a frequency gliding a0→a1, at fraction *u*."""
+    if a0 == a1:
+        np.multiply(u, seconds * a0, out=out)
+        return
+    if curve == "exp" and a0 > 0 and a1 > 0:
+        lr = math.log(a1 / a0)
+        np.multiply(u, lr, out=out); np.exp(out, out=out)
+        out -= 1.0; out *= seconds * a0 / lr
+        return
+    if curve == "cosine":                    # ∫ (1 − cos πu)/2 = u/2 − sin πu / 2π
+        np.multiply(u, math.pi, out=tmp); np.sin(tmp, out=tmp)
+        tmp *= 1 / (2*math.pi)
+        np.multiply(u, 0.5, out=out); out -= tmp
+    else:                                    # ∫ u = u²/2
+        np.multiply(u, u, out=out); out *= 0.5
+    out *= a1 - a0
+    np.multiply(u, a0, out=tmp); out += tmp
+    out *= seconds
+
+
+def _level(out, u, a0, a1, curve):
+    """out ← value gliding a0→a1 at fraction *u*."""
+    if a0 == a1:
+        out.fill(a0)
+        return
+    if curve == "exp" and a0 > 0 and a1 > 0:
+        np.multiply(u, math.log(a1 / a0), out=out); np.exp(out, out=out)
+        out *= a0
+        return
+    if curve == "cosine":
+        np.multiply(u, math.pi, out=out); np.cos(out, out=out)
+        out *= -0.5; out += 0.5
+    else:
+        out[:] = u
+    out *= a1 - a0
+    out += a0
+
+
+# ───── Timeline ─────────────────────────────────────────────────────────────
+class Session:
+    """A compiled timeline that renders stereo binaural audio by frame."""
+
+    def __init__(self, segments: list[dict], sample_rate: int,
+                 library: dict | None = None) -> None:
+        self.sample_rate = sample_rate
+        self.segments = [self._resolve(s, library or {}) for s in segments]
+        if not self.segments:
+            raise ValueError("Session has no segments.")
+        self._compile()
+        self._bufs = None
+
+    @classmethod
+    def load(cls, path: str, sample_rate: int, library: dict | None = None):
+        with open(path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("segments", [])
+        return cls(data, sample_rate, library)
+
+    @staticmethod
+    def _resolve(seg: dict, library: dict) -> dict:
+        seg = dict(seg)
+        if "preset" in seg and not ("carrier" in seg and "beat" in seg):
+            if seg["preset"] not in library:
+                raise ValueError(f"Unknown preset '{seg['preset']}'.")
+            base = library[seg["preset"]]
+            seg.setdefault("carrier", base["carrier"])
+            seg.setdefault("beat", base["beat"])
+        if "carrier" not in seg:
+            raise ValueError("Segment needs 'preset' or 'carrier'.")
+        seg.setdefault("beat", 0.0)
+        seg.setdefault("ramp", 0.0)
+        seg.setdefault("hold", 0.0)
+        seg.setdefault("curve", "linear")
+        if seg["curve"] not in CURVES:
+            raise ValueError(f"Unknown curve '{seg['curve']}' (use {', '.join(CURVES)}).")
+        return seg
+
+    def _compile(self) -> None:
+        """Flatten segments into constant-curve pieces with start phases."""
+        fs = self.sample_rate
+        self._pieces, self._starts, self._seg_ends = [], [], []
+        frame, cyc_c, cyc_b = 0, 0.0, 0.0
+        prev = None
+        tmp, out = np.empty(1), np.empty(1)
+        one = np.ones(1)
+        for seg in self.segments:
+            c1, b1 = float(seg["carrier"]), float(seg["beat"])
+            v1 = float(seg.get("volume", prev[2] if prev else DEFAULT_VOLUME))
+            seg["volume"] = v1
+            c0, b0, v0 = prev or (c1, b1, v1)
+            for n, (a, b, vol, curve) in (
+                    (round(seg["ramp"] * fs), ((c0, c1), (b0, b1), (v0, v1), seg["curve"])),
+                    (round(seg["hold"] * fs), ((c1, c1), (b1, b1), (v1, v1), "linear"))):
+                if n <= 0:
+                    continue
+                self._starts.append(frame)
+                self._pieces.append((frame, n, a, b, vol, curve, cyc_c, cyc_b))
+                # cycles completed by the end of the piece (u = 1)
+                _cycles(out, one, n / fs, *a, curve, tmp); cyc_c = (cyc_c + out[0]) % 1.0
+                _cycles(out, one, n / fs, *b, curve, tmp); cyc_b = (cyc_b + out[0]) % 1.0
+                frame += n
+            prev = (c1, b1, v1)
+            self._seg_ends.append(frame)
+        self.frames = frame
+
+    @property
+    def seconds(self) -> float:
+        return self.frames / self.sample_rate
+
+    def segment_at(self, frame: int) -> int:
+        """Index of the segment playing at *frame* (last one past the end)."""
+        return min(bisect.bisect_right(self._seg_ends, frame),
+                   len(self.segments) - 1)
+
+    def _work(self, frames: int):
+        """Index ramp plus float64 scratch buffers, grown on demand."""
+        if self._bufs is None or len(self._bufs[0]) < frames:
+            self._bufs = [np.arange(frames, dtype=np.float64)]
+            self._bufs += [np.empty(frames) for _ in range(5)]
+        return [b[:frames] for b in self._bufs]
+
+    def render(self, out: np.ndarray, start: int) -> None:
+        """Fill ``out`` (frames × 2) with frames ``start …``; silence past the end."""
+        frames, pos = out.shape[0], 0
+        while pos < frames:
+            n = start + pos
+            if n >= self.frames:
+                out[pos:] = 0.0
+                return
+            k = bisect.bisect_right(self._starts, n) - 1
+            p0, plen, a, b, vol, curve, cyc_c, cyc_b = self._pieces[k]
+            m = min(frames - pos, p0 + plen - n)
+            self._piece(out[pos:pos + m], n - p0, plen, a, b, vol, curve,
+                        cyc_c, cyc_b)
+            pos += m
+
+    def _piece(self, out, off, plen, a, b, vol, curve, cyc_c, cyc_b):
+        idx, u, left, right, tmp, gain = self._work(out.shape[0])
+        np.add(idx, off, out=u); u /= plen
+        seconds = plen / self.sample_rate
+        _cycles(left,  u, seconds, *a, curve, tmp); left  += cyc_c
+        _cycles(right, u, seconds, *b, curve, tmp); right += cyc_b
+        right += left
+        for ch, cyc in enumerate((left, right)):
+            np.floor(cyc, out=tmp); cyc -= tmp; cyc *= 2*math.pi
+            np.sin(cyc, out=out[:, ch])
+        _level(gain, u, *vol, curve)
+        out *= gain[:, None]
+
+    def chunks(self, chunk: int = 65_536):
+        """Yield successive float32 ``(n, 2)`` blocks of the whole session."""
+        buf = np.empty((chunk, 2), dtype=np.float32)
+        for start in range(0, self.frames, chunk):
+            n = min(chunk, self.frames - start)
+            self.render(buf[:n], start)
+            yield buf[:n]
@@ -0,0 +1,196 @@
+"""
+tts_cache.py
+────────────
+Text-to-speech for the Affirmation Loop, synthesised off the UI thread and
+kept on disk so the same words are only ever spoken once.
+
+• tts_key()    → content hash of (text, voice, rate, engine)
+• TTSCache     → directory of rendered clips, LRU-evicted by total size
+• Synthesiser  → cache lookup, else synthesis in a worker process
+
+Clips are stored as 16-bit mono WAV at the playback rate under their
+key, so a hit is one file read.  A miss is spoken by pyttsx3 in a single
+long-lived worker process (speech engines want their own main thread)
+into a uniquely named file, resampled, and renamed into place, so two
+running apps never share a temporary file or see a half-written clip.
+"""
+
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from resampling import resample
+
+CACHE_DIR  = os.path.join("affirmations", "tts_cache")
+MAX_BYTES  = 256 * 2**20                  # cache size before LRU eviction
+ENGINE     = {"win32": "sapi5", "darwin": "nsss"}.get(sys.platform, "espeak")
+
+
+def tts_key(text: str, voice: str | None = None, rate: int | None = None,
+            engine: str = ENGINE) -> str:
+    """Cache key of a clip: SHA-256 over everything that changes the audio."""
+    blob = json.dumps([text, voice, rate, engine], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ───── Disk cache ───────────────────────────────────────────────────────────
+class TTSCache:
+    """Rendered clips in *directory*, at most *max_bytes* in total.
+
+    A hit refreshes the clip's mtime; ``evict`` removes the least recently
+    used clips until the total fits.  ``stats`` counts hits and misses and
+    the synthesis time spent on misses.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES) -> None:
+        self.dir = str(directory)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "synth_s": 0.0}
+        os.makedirs(self.dir, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.dir, f"{key}.wav")
+
+    def load(self, key: str) -> np.ndarray | None:
+        """The clip for *key* as float32, or None (counted as hit / miss)."""
+        import soundfile as sf
+
+        path = self.path(key)
+        try:
+            data, _ = sf.read(path, dtype="float32")
+            os.utime(path)                         # most recently used
+        except (OSError, RuntimeError):            # missing or torn by eviction
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return data
+
+    def store(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        import soundfile as sf
+
+        tmp = os.path.join(self.dir, f".{uuid.uuid4().hex}.wav")
+        sf.write(tmp, audio, sample_rate, subtype="PCM_16")
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def clips(self) -> list[tuple[float, int, str]]:
+        """(mtime, bytes, path) of every cached clip, oldest first."""
+        out = []
+        for entry in os.scandir(self.dir):
+            if entry.name.endswith(".wav") and not entry.name.startswith("."):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, entry.path))
+        return sorted(out)
+
+    def evict(self) -> int:
+        """Drop least recently used clips until under ``max_bytes``.
+
+        Temporary files left by a crashed app or worker (an hour old) go too.
+        """
+        for entry in os.scandir(self.dir):
+            try:
+                if entry.name.startswith(".") and time.time() - entry.stat().st_mtime > 3600:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+        clips = self.clips()
+        total, dropped = sum(size for _, size, _ in clips), 0
+        for _, size, path in clips:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size; dropped += 1
+        return dropped
+
+    def summary(self) -> str:
+        clips = self.clips()
+        s = self.stats
+        avg = s["synth_s"] / s["misses"] if s["misses"] else 0.0
+        return (f"TTS cache: {s['hits']} hits, {s['misses']} misses"
+                f" (avg synthesis {avg:.2f} s), {len(clips)} clips, "
+                f"{sum(c[1] for c in clips) / 2**20:.1f} MB")
+
+
+# ───── Synthesis ────────────────────────────────────────────────────────────
+def _speak(text: str, voice: str | None, rate: int | None, path: str) -> float:
+    """Worker process: speak *text* into *path*; returns the seconds taken."""
+    import pyttsx3
+
+    t0 = time.perf_counter()
+    engine = pyttsx3.init()
+    if voice:
+        engine.setProperty("voice", voice)
+    if rate:
+        engine.setProperty("rate", rate)
+    engine.save_to_file(text, path)
+    engine.runAndWait()
+    return time.perf_counter() - t0
+
+
+class Synthesiser:
+    """TTS clips at *sample_rate*, from *cache* or a background worker.
+
+    ``request`` returns a Future of ``(audio, info)`` where audio is mono
+    float32 and info is ``{"key", "hit", "synth_s"}``.  Hits resolve at
+    once; misses resolve when the worker has spoken and the clip has been
+    resampled and cached.  Poll ``done()`` from the UI, never block on it.
+    """
+
+    def __init__(self, cache: TTSCache, sample_rate: int,
+                 voice: str | None = None, rate: int | None = None) -> None:
+        self.cache, self.sample_rate = cache, sample_rate
+        self.voice, self.rate = voice, rate
+        self._pool = None
+
+    def request(self, text: str) -> Future:
+        key = tts_key(text, self.voice, self.rate)
+        out = Future()
+        audio = self.cache.load(key)
+        if audio is not None:
+            out.set_result((audio, {"key": key, "hit": True, "synth_s": 0.0}))
+            return out
+        if self._pool is None:                     # first miss: start the worker
+            self._pool = ProcessPoolExecutor(max_workers=1,
+                                             mp_context=mp.get_context("spawn"))
+        raw = os.path.join(self.cache.dir, f".{uuid.uuid4().hex}.raw.wav")
+        job = self._pool.submit(_speak, text, self.voice, self.rate, raw)
+        job.add_done_callback(lambda j: self._finish(j, key, raw, out))
+        return out
+
+    def _finish(self, job: Future, key: str, raw: str, out: Future) -> None:
+        import soundfile as sf
+
+        try:
+            secs = job.result()
+            data, sr = sf.read(raw, dtype="float32", always_2d=True)
+            audio = resample(data.mean(axis=1), sr, self.sample_rate).astype(np.float32)
+            self.cache.store(key, audio, self.sample_rate)
+            self.cache.stats["synth_s"] += secs
+            out.set_result((audio, {"key": key, "hit": False, "synth_s": secs}))
+        except BaseException as e:
+            if isinstance(e, BrokenProcessPool):
+                self._pool = None                  # worker died: restart on next miss
+            out.set_exception(e)
+        finally:
+            if os.path.exists(raw):
+                os.remove(raw)
+
+    def close(self) -> None:
+        """Stop the worker; a synthesis in progress is abandoned."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None